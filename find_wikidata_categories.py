@@ -9,11 +9,16 @@ Uses Web API primarily to avoid SPARQL rate limits.
 """
 
 import argparse
+import json
 import logging
+import sqlite3
 import sys
 import time
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(
@@ -22,18 +27,69 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Transport retries for the idempotent API GETs
+API_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=['GET'])
+
+# Labels, descriptions and P31 claims of concept classes rarely change
+ENTITY_CACHE_PATH = Path.home() / '.cache' / 'wikidataseekmed' / 'entities.sqlite'
+ENTITY_CACHE_TTL = 30 * 86400
+
+
+class EntityCache:
+    """
+    Persistent cache of wbgetentities results (SQLite)
+
+    Entries are keyed by QID, stored as JSON and expire after `ttl` seconds.
+    """
+
+    def __init__(self, path: Path, ttl: int = ENTITY_CACHE_TTL):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entities (qid TEXT PRIMARY KEY, fetched_at INT, body TEXT)"
+        )
+        self._conn.commit()
+
+    def get(self, qid: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entity, or None if missing or expired"""
+        row = self._conn.execute(
+            "SELECT body FROM entities WHERE qid = ? AND fetched_at >= ?",
+            (qid, int(time.time()) - self.ttl),
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, qid: str, entity: Dict[str, Any]) -> None:
+        """Store an entity, replacing an existing entry"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entities (qid, fetched_at, body) VALUES (?, ?, ?)",
+            (qid, int(time.time()), json.dumps(entity, ensure_ascii=False)),
+        )
+        self._conn.commit()
+
 
 class WikidataCategoryFinder:
     """Search for Wikidata medical concepts by keyword using Web API"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[EntityCache] = None):
         self.api_url = "https://www.wikidata.org/w/api.php"
+        self.cache = cache
+        # Entity lookups answered from the cache vs. sent to the API
+        self.cache_hits = 0
+        self.entity_requests = 0
 
         # For API requests
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'WikidataCategoryFinder/1.0 (https://github.com/wikidataseekmed)'
+            'User-Agent': 'WikidataCategoryFinder/1.0 (https://github.com/wikidataseekmed)',
+            'Accept-Encoding': 'gzip, deflate',
         })
+        # All requests are GETs to one host: keep the connection alive and
+        # retry transient failures (429/5xx honour Retry-After)
+        adapter = HTTPAdapter(pool_connections=1, max_retries=API_RETRY)
+        self.session.mount('https://', adapter)
 
         # Medical-related keywords to prioritize results
         self.medical_keywords = {
@@ -148,6 +204,12 @@ class WikidataCategoryFinder:
         Returns:
             Entity data or None
         """
+        if self.cache is not None:
+            entity = self.cache.get(qid)
+            if entity is not None:
+                self.cache_hits += 1
+                return entity
+
         params = {
             'action': 'wbgetentities',
             'ids': qid,
@@ -156,13 +218,17 @@ class WikidataCategoryFinder:
             'format': 'json',
         }
 
+        self.entity_requests += 1
         try:
             response = self.session.get(self.api_url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
             if 'entities' in data and qid in data['entities']:
-                return data['entities'][qid]
+                entity = data['entities'][qid]
+                if self.cache is not None and 'missing' not in entity:
+                    self.cache.set(qid, entity)
+                return entity
 
             return None
 
@@ -292,6 +358,7 @@ class WikidataCategoryFinder:
             # Get details via API
             logger.info(f"Checking {i+1}/{len(search_results)}: {qid} ({label})")
 
+            requests_before = self.entity_requests
             details = self.get_concept_details(qid)
 
             if not details:
@@ -323,8 +390,12 @@ class WikidataCategoryFinder:
 
             concepts.append(concept_info)
 
-            # Be nice to the API
-            time.sleep(0.5)
+            # Be nice to the API (not needed when every entity came from the cache)
+            if self.entity_requests > requests_before:
+                time.sleep(0.5)
+
+        if self.cache is not None:
+            logger.info(f"Entity cache: {self.cache_hits} hits, {self.entity_requests} API requests")
 
         return concepts
 
@@ -384,11 +455,17 @@ def main():
         default='table',
         help='Output format (default: table)'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Do not use the entity cache ({ENTITY_CACHE_PATH}, kept for 30 days)'
+    )
 
     args = parser.parse_args()
 
     try:
-        finder = WikidataCategoryFinder()
+        cache = None if args.no_cache else EntityCache(ENTITY_CACHE_PATH)
+        finder = WikidataCategoryFinder(cache=cache)
 
         # Find concepts
         concepts = finder.find_concepts(
@@ -407,7 +484,6 @@ def main():
             print(finder.format_for_config(concepts))
 
         elif args.output == 'json':
-            import json
             print(json.dumps(concepts, indent=2, ensure_ascii=False))
 
         else:  # table
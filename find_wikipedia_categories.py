@@ -9,8 +9,12 @@ Useful for finding appropriate Category:$name for data extraction.
 import argparse
 import logging
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +23,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Transport retries for the idempotent API GETs
+API_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=['GET'])
+
+# Parallel pageprops requests in get_wikidata_qids
+QID_LOOKUP_WORKERS = 8
+
 
 class WikipediaCategoryFinder:
     """Search for Wikipedia categories and their members"""
@@ -27,10 +38,46 @@ class WikipediaCategoryFinder:
         self.language = language
         self.api_url = f"https://{language}.wikipedia.org/w/api.php"
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'WikipediaCategoryFinder/1.0 (https://github.com/wikidataseekmed)'
+        self.session = self._new_session()
+        # Worker threads of get_wikidata_qids each get their own session; the
+        # pool and its sessions are kept across calls and released by close()
+        self._local = threading.local()
+        self._worker_sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _new_session() -> requests.Session:
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'WikipediaCategoryFinder/1.0 (https://github.com/wikidataseekmed)',
+            'Accept-Encoding': 'gzip, deflate',
         })
+        # All requests are GETs to one host: keep the connection alive and
+        # retry transient failures (429/5xx honour Retry-After)
+        adapter = HTTPAdapter(pool_connections=1, max_retries=API_RETRY)
+        session.mount('https://', adapter)
+        return session
+
+    def _thread_session(self) -> requests.Session:
+        """Session owned by the calling thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._new_session()
+            with self._sessions_lock:
+                self._worker_sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        """Shut down the QID lookup pool and close every session"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._sessions_lock:
+            for session in self._worker_sessions:
+                session.close()
+            self._worker_sessions.clear()
+        self.session.close()
 
     def search_categories(
         self,
@@ -103,33 +150,53 @@ class WikipediaCategoryFinder:
 
         # Wikipedia API can handle up to 50 titles per request
         batch_size = 50
+        batches = [page_titles[i:i + batch_size]
+                   for i in range(0, len(page_titles), batch_size)]
         qid_map = {}
 
-        for i in range(0, len(page_titles), batch_size):
-            batch = page_titles[i:i + batch_size]
+        if len(batches) == 1:
+            qid_map.update(self._fetch_qid_batch(batches[0], self.session))
+            return qid_map
 
-            params = {
-                'action': 'query',
-                'titles': '|'.join(batch),
-                'prop': 'pageprops',
-                'ppprop': 'wikibase_item',
-                'format': 'json'
-            }
+        # Batches are independent: overlap their round trips
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=QID_LOOKUP_WORKERS)
+        for batch_map in self._executor.map(
+                lambda batch: self._fetch_qid_batch(batch, self._thread_session()),
+                batches):
+            qid_map.update(batch_map)
+
+        return qid_map
+
+    def _fetch_qid_batch(
+        self,
+        batch: List[str],
+        session: requests.Session
+    ) -> Dict[str, Optional[str]]:
+        """Fetch QIDs for up to 50 page titles (empty dict on failure)"""
+        params = {
+            'action': 'query',
+            'titles': '|'.join(batch),
+            'prop': 'pageprops',
+            'ppprop': 'wikibase_item',
+            'format': 'json'
+        }
 
-            try:
-                response = self.session.get(self.api_url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
+        qid_map = {}
+        try:
+            response = session.get(self.api_url, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json()
 
-                pages = data.get('query', {}).get('pages', {})
-                for page_data in pages.values():
-                    title = page_data.get('title')
-                    qid = page_data.get('pageprops', {}).get('wikibase_item')
-                    if title:
-                        qid_map[title] = qid
+            pages = data.get('query', {}).get('pages', {})
+            for page_data in pages.values():
+                title = page_data.get('title')
+                qid = page_data.get('pageprops', {}).get('wikibase_item')
+                if title:
+                    qid_map[title] = qid
 
-            except Exception as e:
-                logger.error(f"Failed to get QIDs for batch: {e}")
+        except Exception as e:
+            logger.error(f"Failed to get QIDs for batch: {e}")
 
         return qid_map
 
@@ -266,6 +333,7 @@ def main():
 
     args = parser.parse_args()
 
+    finder = None
     try:
         finder = WikipediaCategoryFinder(language=args.language)
 
@@ -353,6 +421,10 @@ def main():
         logger.error(f"Failed: {e}", exc_info=True)
         sys.exit(1)
 
+    finally:
+        if finder is not None:
+            finder.close()
+
 
 if __name__ == '__main__':
     main()
@@ -6,19 +6,73 @@ Usage:
 """
 
 from SPARQLWrapper import SPARQLWrapper, JSON
-import pandas as pd
 import time
 from datetime import datetime
 import os
+import csv
+import asyncio
 import argparse
 from http.client import IncompleteRead
 from urllib.error import URLError, HTTPError
 import socket
 import logging
+import sys
 import traceback
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# External ID key -> (Wikidata property, SPARQL variable, output column)
+EXTERNAL_ID_PROPERTIES = {
+    'mesh': ('wdt:P486', 'meshId', 'mesh_id'),
+    'icd10': ('wdt:P494', 'icd10', 'icd10'),
+    'icd9': ('wdt:P493', 'icd9', 'icd9'),
+    'snomed': ('wdt:P5806', 'snomedId', 'snomed_id'),
+    'umls': ('wdt:P2892', 'umlsId', 'umls_id'),
+}
+
+# Columns every extracted term has, in output order (external ID columns follow)
+BASE_COLUMNS = ['qid', 'category_en', 'category_ja', 'category_qid',
+                'en_label', 'ja_label', 'en_description', 'ja_description']
+
+# Columns stored as pandas categoricals when their cardinality is low
+CATEGORICAL_COLUMNS = ['category_en', 'category_ja', 'mesh_id', 'icd10', 'icd9', 'snomed_id', 'umls_id']
+
+# Output files are written through a 1 MB buffer, CSVs in fixed-size row chunks
+WRITE_BUFFER_SIZE = 1 << 20
+CSV_CHUNK_SIZE = 100_000
+
+# Characters replaced with '_' in per-category file names
+_FN_TR = str.maketrans({'/': '_', '\\': '_', ' ': '_'})
+
+
+def write_csv(df, csv_file, columns=None):
+    """Write a DataFrame as UTF-8 (BOM) CSV in row chunks through a large buffer"""
+    with open(csv_file, 'w', encoding='utf-8-sig', newline='', buffering=WRITE_BUFFER_SIZE) as f:
+        df.to_csv(f, columns=columns, index=False, chunksize=CSV_CHUNK_SIZE)
+
+
+def write_json_lines(df, json_file, columns=None):
+    """Stream the DataFrame as JSON Lines, one record per line (uses orjson if installed)"""
+    if columns is None:
+        columns = list(df.columns)
+    else:
+        df = df[columns]
+    with open(json_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        for row in df.itertuples(index=False, name=None):
+            record = dict(zip(columns, row))
+            if orjson is not None:
+                f.write(orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS))
+            else:
+                f.write(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+            f.write(b'\n')
+
 
 class MedicalTermsExtractor:
-    def __init__(self, batch_size=1000, max_retries=5, log_file=None):
+    def __init__(self, batch_size=1000, max_retries=5, log_file=None, enabled_ids=None):
         self.sparql = SPARQLWrapper("https://query.wikidata.org/sparql")
         self.sparql.setReturnFormat(JSON)
         self.sparql.addCustomHttpHeader("User-Agent", "MedicalTermsExtractor/1.0")
@@ -27,6 +81,11 @@ class MedicalTermsExtractor:
         self.batch_size = batch_size
         self.max_retries = max_retries
         
+        # Only the requested external IDs are added as OPTIONAL joins
+        if enabled_ids is None:
+            enabled_ids = EXTERNAL_ID_PROPERTIES.keys()
+        self.enabled_ids = set(enabled_ids)
+        
         self.setup_logging(log_file)
         
         self.stats = {
@@ -40,6 +99,11 @@ class MedicalTermsExtractor:
             'other_errors': 0,
         }
         
+        # Per-category counts and Japanese names, filled once by extract_all
+        self._cat_counts = None
+        self._cat_ja_map = {}
+        self._qid_unique = None
+        
         # English category definitions (small scale)
         self.small_test_categories = {
             'Q12136': 'disease',
@@ -184,6 +248,15 @@ class MedicalTermsExtractor:
         else:
             self.logger = logging.getLogger('WikidataExtractor')
             self.logger.addHandler(logging.NullHandler())
+        
+        # User-facing summary lines go to stdout and, through propagation,
+        # to the log file, so they are formatted once and only when emitted
+        self.console = logging.getLogger('WikidataExtractor.console')
+        self.console.setLevel(logging.INFO)
+        if not self.console.handlers:
+            sh = logging.StreamHandler(sys.stdout)
+            sh.setFormatter(logging.Formatter('%(message)s'))
+            self.console.addHandler(sh)
     
     def discover_medical_categories(self, limit=100):
         """
@@ -289,8 +362,11 @@ class MedicalTermsExtractor:
                 'category_ja': ja_name
             })
         
-        df = pd.DataFrame(rows)
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        # Plain csv module: no need to load pandas for a three-column file
+        with open(filepath, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['qid', 'category_en', 'category_ja'])
+            writer.writeheader()
+            writer.writerows(rows)
         
         print("\nDiscovered categories saved to: " + filepath)
         self.logger.info("Saved discovered categories to: " + filepath)
@@ -486,9 +562,15 @@ class MedicalTermsExtractor:
     
     def fetch_batch(self, category_qid, category_name, offset, batch_size):
         """Fetch one batch of data from specified offset"""
+        id_vars = ""
+        id_optionals = ""
+        for key, (prop, var, _) in EXTERNAL_ID_PROPERTIES.items():
+            if key in self.enabled_ids:
+                id_vars += " ?" + var
+                id_optionals += "\n          OPTIONAL { ?item " + prop + " ?" + var + " }"
+        
         query = """
-        SELECT DISTINCT ?item ?enLabel ?jaLabel ?enDescription ?jaDescription 
-               ?meshId ?icd10 ?icd9 ?snomedId ?umlsId
+        SELECT DISTINCT ?item ?enLabel ?jaLabel ?enDescription ?jaDescription""" + id_vars + """
         WHERE {
           ?item wdt:P31/wdt:P279* wd:""" + category_qid + """ .
           
@@ -509,12 +591,7 @@ class MedicalTermsExtractor:
             ?item schema:description ?jaDescription .
             FILTER(LANG(?jaDescription) = "ja")
           }
-          
-          OPTIONAL { ?item wdt:P486 ?meshId }
-          OPTIONAL { ?item wdt:P494 ?icd10 }
-          OPTIONAL { ?item wdt:P493 ?icd9 }
-          OPTIONAL { ?item wdt:P5806 ?snomedId }
-          OPTIONAL { ?item wdt:P2892 ?umlsId }
+          """ + id_optionals + """
         }
         LIMIT """ + str(batch_size) + """
         OFFSET """ + str(offset)
@@ -579,12 +656,10 @@ class MedicalTermsExtractor:
                         'ja_label': result.get('jaLabel', {}).get('value', ''),
                         'en_description': result.get('enDescription', {}).get('value', ''),
                         'ja_description': result.get('jaDescription', {}).get('value', ''),
-                        'mesh_id': result.get('meshId', {}).get('value', ''),
-                        'icd10': result.get('icd10', {}).get('value', ''),
-                        'icd9': result.get('icd9', {}).get('value', ''),
-                        'snomed_id': result.get('snomedId', {}).get('value', ''),
-                        'umls_id': result.get('umlsId', {}).get('value', ''),
                     }
+                    for key, (_, var, col) in EXTERNAL_ID_PROPERTIES.items():
+                        if key in self.enabled_ids:
+                            term[col] = result.get(var, {}).get('value', '')
                     all_terms.append(term)
                 
                 if len(bindings) < current_batch_size:
@@ -615,6 +690,9 @@ class MedicalTermsExtractor:
     
     def extract_all(self, categories, limit_per_category=None):
         """Extract medical terms from all categories"""
+        import numpy as np
+        import pandas as pd
+        
         all_terms = []
         
         print("\n" + "="*60)
@@ -691,7 +769,12 @@ class MedicalTermsExtractor:
             return df
         
         original_count = len(df)
-        df = df.drop_duplicates(subset=['qid'])
+        # Hash the QIDs once: the codes give both the first occurrence of each
+        # item (deduplication) and the unique count used by the analysis
+        qid_codes, qid_uniques = pd.factorize(df['qid'], sort=False)
+        first_rows = np.sort(np.unique(qid_codes, return_index=True)[1])
+        df = df.iloc[first_rows].reset_index(drop=True)
+        self._qid_unique = len(qid_uniques)
         duplicates_removed = original_count - len(df)
         
         if duplicates_removed > 0:
@@ -704,53 +787,79 @@ class MedicalTermsExtractor:
             self.logger.info("Duplicates removed: " + str(duplicates_removed))
             self.logger.info("Unique items: " + str(len(df)))
         
+        # Low-cardinality string columns become categoricals so that masks,
+        # value_counts and the per-category split work on integer codes
+        for col in CATEGORICAL_COLUMNS:
+            if col not in df.columns:
+                continue
+            if col.startswith('category_') or df[col].nunique() < len(df) / 2:
+                df[col] = df[col].astype('category')
+        
+        # Shared by analyze_data_quality and the report writer
+        self._cat_counts = df['category_en'].value_counts()
+        self._cat_ja_map = {c: self.category_japanese_names.get(c, c) for c in self._cat_counts.index}
+        
         return df
     
-    def analyze_data_quality(self, df):
-        """Analyze data quality"""
-        if len(df) == 0:
-            print("No data available. Skipping analysis.")
-            return pd.DataFrame()
+    def category_counts(self, df):
+        """Return cached per-category counts, computing them if extract_all did not"""
+        if self._cat_counts is None:
+            self._cat_counts = df['category_en'].value_counts()
+            self._cat_ja_map = {c: self.category_japanese_names.get(c, c) for c in self._cat_counts.index}
+        return self._cat_counts
+    
+    def compute_quality_stats(self, df):
+        """Compute coverage counts, category counts and bilingual pairs shared by the analysis and the report"""
+        n = len(df)
         
-        print("\n" + "="*60)
-        print("Data Quality Analysis")
-        print("="*60 + "\n")
+        # Count non-empty values of every checked column in one vectorized pass
+        check_cols = [c for c in ['en_label', 'ja_label', 'en_description', 'ja_description',
+                                  'mesh_id', 'icd10', 'icd9', 'snomed_id', 'umls_id']
+                      if c in df.columns]
+        nonempty = df[check_cols].notna() & df[check_cols].ne('')
+        counts = nonempty.sum()
+        pct = (counts / n * 100).round(1)
         
-        self.logger.info("")
-        self.logger.info("="*60)
-        self.logger.info("DATA QUALITY ANALYSIS")
-        self.logger.info("="*60)
+        # The label columns of the coverage mask already give the bilingual rows
+        bilingual_mask = nonempty['en_label'] & nonempty['ja_label']
         
-        print("1. Basic Statistics:")
-        total_msg = "   Total records: " + str(len(df))
-        print(total_msg)
-        self.logger.info("Total Records: " + str(len(df)))
+        return {
+            'counts': counts,
+            'pct': pct,
+            'cat_counts': self.category_counts(df),
+            'bilingual_mask': bilingual_mask,
+            'bilingual': df[bilingual_mask],
+        }
+    
+    def analyze_data_quality(self, df):
+        """Analyze data quality and return the computed statistics"""
+        log = self.console.info
+        if len(df) == 0:
+            log("No data available. Skipping analysis.")
+            return {'bilingual': df}
         
-        unique_msg = "   Unique QIDs: " + str(df['qid'].nunique())
-        print(unique_msg)
-        self.logger.info("Unique QIDs: " + str(df['qid'].nunique()))
+        log("\n%s\nData Quality Analysis\n%s\n", "="*60, "="*60)
         
-        print("\n2. Language Coverage:")
-        has_en = (df['en_label'].notna() & (df['en_label'] != '')).sum()
-        has_ja = (df['ja_label'].notna() & (df['ja_label'] != '')).sum()
-        en_msg = "   English labels: " + str(has_en) + " (" + str(round(has_en/len(df)*100, 1)) + "%)"
-        print(en_msg)
-        self.logger.info("English Labels: " + str(has_en) + " (" + str(round(has_en/len(df)*100, 1)) + "%)")
+        n = len(df)
+        unique_qids = self._qid_unique if self._qid_unique is not None else df['qid'].nunique()
         
-        ja_msg = "   Japanese labels: " + str(has_ja) + " (" + str(round(has_ja/len(df)*100, 1)) + "%)"
-        print(ja_msg)
-        self.logger.info("Japanese Labels: " + str(has_ja) + " (" + str(round(has_ja/len(df)*100, 1)) + "%)")
+        quality = self.compute_quality_stats(df)
+        counts = quality['counts']
+        pct = quality['pct']
         
-        print("\n3. Description Coverage:")
-        has_en_desc = (df['en_description'].notna() & (df['en_description'] != '')).sum()
-        has_ja_desc = (df['ja_description'].notna() & (df['ja_description'] != '')).sum()
-        en_desc_msg = "   English descriptions: " + str(has_en_desc) + " (" + str(round(has_en_desc/len(df)*100, 1)) + "%)"
-        print(en_desc_msg)
+        log("1. Basic Statistics:")
+        log("   Total records: %s", n)
+        log("   Unique QIDs: %s", unique_qids)
         
-        ja_desc_msg = "   Japanese descriptions: " + str(has_ja_desc) + " (" + str(round(has_ja_desc/len(df)*100, 1)) + "%)"
-        print(ja_desc_msg)
+        log("\n2. Language Coverage:")
+        log("   English labels: %s (%s%%)", counts['en_label'], pct['en_label'])
+        log("   Japanese labels: %s (%s%%)", counts['ja_label'], pct['ja_label'])
         
-        print("\n4. External ID Coverage:")
+        log("\n3. Description Coverage:")
+        log("   English descriptions: %s (%s%%)", counts['en_description'], pct['en_description'])
+        log("   Japanese descriptions: %s (%s%%)", counts['ja_description'], pct['ja_description'])
+        
+        log("\n4. External ID Coverage:")
         external_ids = [
             ('mesh_id', 'MeSH'),
             ('icd10', 'ICD-10'),
@@ -759,38 +868,27 @@ class MedicalTermsExtractor:
             ('umls_id', 'UMLS')
         ]
         for col, name in external_ids:
-            count = (df[col].notna() & (df[col] != '')).sum()
-            ext_msg = "   " + name + ": " + str(count) + " (" + str(round(count/len(df)*100, 1)) + "%)"
-            print(ext_msg)
-            self.logger.info(name + ": " + str(count) + " (" + str(round(count/len(df)*100, 1)) + "%)")
+            if col not in counts:
+                continue
+            log("   %s: %s (%s%%)", name, counts[col], pct[col])
         
-        print("\n5. Items by Category:")
-        self.logger.info("")
-        self.logger.info("Category Breakdown:")
-        category_counts = df['category_en'].value_counts().sort_values(ascending=False)
-        for category, count in category_counts.items():
-            cat_ja = self.category_japanese_names.get(category, category)
-            cat_msg = "   " + category + " (" + cat_ja + "): " + str(count)
-            print(cat_msg)
-            self.logger.info("  " + category + ": " + str(count))
-        
-        print("\n6. English-Japanese Pairs:")
-        bilingual = df[(df['en_label'] != '') & (df['ja_label'] != '')]
-        bi_msg = "   Bilingual pairs: " + str(len(bilingual)) + " (" + str(round(len(bilingual)/len(df)*100, 1)) + "%)"
-        print(bi_msg)
-        self.logger.info("")
-        self.logger.info("Bilingual Pairs: " + str(len(bilingual)) + " (" + str(round(len(bilingual)/len(df)*100, 1)) + "%)")
+        log("\n5. Items by Category:")
+        for category, count in quality['cat_counts'].items():
+            log("   %s (%s): %s", category, self._cat_ja_map[category], count)
         
-        print("\n" + "="*60 + "\n")
-        self.logger.info("="*60)
+        log("\n6. English-Japanese Pairs:")
+        bilingual = quality['bilingual']
+        log("   Bilingual pairs: %s (%.1f%%)", len(bilingual), len(bilingual) / n * 100)
+        
+        log("\n%s\n", "="*60)
         
-        return bilingual
+        return quality
     
-    def save_results(self, df, prefix="small"):
-        """Save results as CSV and JSON"""
+    async def save_results(self, df, prefix="small", quality=None):
+        """Save results as CSV, JSON Lines and Parquet (coroutine; writes run in worker threads)"""
+        log = self.console.info
         if len(df) == 0:
-            print("No data to save. Skipping.")
-            self.logger.warning("No data to save")
+            self.console.warning("No data to save. Skipping.")
             return {}
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -798,114 +896,130 @@ class MedicalTermsExtractor:
         
         os.makedirs(output_dir, exist_ok=True)
         
-        print("Saving results...\n")
-        self.logger.info("")
-        self.logger.info("Saving results...")
+        log("Saving results...\n")
         
-        # Full CSV
         full_csv = output_dir + "/" + prefix + "_medical_terms_full_" + timestamp + ".csv"
-        df.to_csv(full_csv, index=False, encoding='utf-8-sig')
-        file_size_mb = os.path.getsize(full_csv) / (1024 * 1024)
-        full_msg = "   Full CSV: " + full_csv + " (" + str(round(file_size_mb, 2)) + " MB)"
-        print(full_msg)
-        self.logger.info("Full CSV: " + full_csv + " (" + str(round(file_size_mb, 2)) + " MB)")
-        
-        # EN-JA pairs CSV
-        bilingual_df = df[(df['en_label'] != '') & (df['ja_label'] != '')].copy()
+        
+        if quality is None:
+            quality = self.compute_quality_stats(df)
+        bilingual_df = quality['bilingual']
+        bilingual_csv = None
         if len(bilingual_df) > 0:
             bilingual_csv = output_dir + "/" + prefix + "_en_ja_pairs_" + timestamp + ".csv"
-            cols_to_save = ['en_label', 'ja_label', 'category_en', 'category_ja', 
-                           'en_description', 'ja_description', 'qid']
-            bilingual_df[cols_to_save].to_csv(bilingual_csv, index=False, encoding='utf-8-sig')
-            file_size_mb = os.path.getsize(bilingual_csv) / (1024 * 1024)
-            bi_msg = "   EN-JA pairs CSV: " + bilingual_csv + " (" + str(len(bilingual_df)) + " pairs, " + str(round(file_size_mb, 2)) + " MB)"
-            print(bi_msg)
-            self.logger.info("EN-JA pairs CSV: " + bilingual_csv + " (" + str(len(bilingual_df)) + " pairs, " + str(round(file_size_mb, 2)) + " MB)")
-        
-        # Category CSVs
+        cols_to_save = ['en_label', 'ja_label', 'category_en', 'category_ja', 
+                       'en_description', 'ja_description', 'qid']
+        
+        # Only the known term columns are serialized, in a fixed order
+        output_cols = BASE_COLUMNS + [col for key, (_, _, col) in EXTERNAL_ID_PROPERTIES.items()
+                                      if key in self.enabled_ids]
+        output_cols = [col for col in output_cols if col in df.columns]
+        
         category_dir = output_dir + "/by_category_" + timestamp
         os.makedirs(category_dir, exist_ok=True)
-        for category in df['category_en'].unique():
-            cat_df = df[df['category_en'] == category]
-            safe_name = category.replace('/', '_').replace('\\', '_').replace(' ', '_')
+        
+        json_file = output_dir + "/" + prefix + "_medical_terms_" + timestamp + ".jsonl"
+        parquet_file = output_dir + "/" + prefix + "_medical_terms_" + timestamp + ".parquet"
+        report_file = output_dir + "/" + prefix + "_report_" + timestamp + ".txt"
+        
+        # The output files are independent of each other, so each write is
+        # handed to a worker thread and awaited together (pandas releases the
+        # GIL while writing)
+        tasks = [asyncio.to_thread(write_csv, df, full_csv, output_cols)]
+        
+        if bilingual_csv:
+            tasks.append(asyncio.to_thread(write_csv, bilingual_df[cols_to_save], bilingual_csv))
+        
+        # Single grouped pass instead of one boolean mask per category
+        cat_count = 0
+        for category, cat_df in df.groupby('category_en', sort=False, observed=True):
+            safe_name = category.translate(_FN_TR)
             cat_file = category_dir + "/" + safe_name + ".csv"
-            cat_df.to_csv(cat_file, index=False, encoding='utf-8-sig')
-        cat_count = len(df['category_en'].unique())
-        cat_msg = "   Category CSVs: " + category_dir + "/ (" + str(cat_count) + " files)"
-        print(cat_msg)
-        self.logger.info("Category CSVs: " + category_dir + "/ (" + str(cat_count) + " files)")
+            tasks.append(asyncio.to_thread(write_csv, cat_df, cat_file, output_cols))
+            cat_count += 1
         
-        # JSON
-        json_file = output_dir + "/" + prefix + "_medical_terms_" + timestamp + ".json"
-        df.to_json(json_file, orient='records', force_ascii=False, indent=2)
-        file_size_mb = os.path.getsize(json_file) / (1024 * 1024)
-        json_msg = "   JSON: " + json_file + " (" + str(round(file_size_mb, 2)) + " MB)"
-        print(json_msg)
-        self.logger.info("JSON: " + json_file + " (" + str(round(file_size_mb, 2)) + " MB)")
+        tasks.append(asyncio.to_thread(write_json_lines, df, json_file, output_cols))
+        tasks.append(asyncio.to_thread(df.to_parquet, parquet_file, engine='pyarrow',
+                                       compression='zstd', index=False))
+        tasks.append(asyncio.to_thread(self.write_report, df, quality, report_file, prefix))
         
-        # Report
-        report_file = output_dir + "/" + prefix + "_report_" + timestamp + ".txt"
-        bilingual_count = len(bilingual_df) if len(bilingual_df) > 0 else 0
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("="*60 + "\n")
-            f.write("Wikidata Medical Terms Extraction Report\n")
-            f.write("="*60 + "\n\n")
-            f.write("Execution time: " + datetime.now().strftime('%Y-%m-%d %H:%M:%S') + "\n")
-            f.write("Scale: " + prefix + "\n")
-            f.write("Total items: " + str(len(df)) + "\n")
-            f.write("EN-JA pairs: " + str(bilingual_count) + "\n")
-            if len(df) > 0:
-                f.write("Bilingual ratio: " + str(round(bilingual_count/len(df)*100, 1)) + "%\n\n")
-            
-            f.write("Statistics:\n")
-            f.write("  Total queries: " + str(self.stats['total_queries']) + "\n")
-            f.write("  Successful: " + str(self.stats['successful_queries']) + "\n")
-            f.write("  Failed: " + str(self.stats['failed_queries']) + "\n")
-            f.write("  Retries: " + str(self.stats['total_retries']) + "\n\n")
-            
-            f.write("Error Breakdown:\n")
-            f.write("  504 Gateway Timeout: " + str(self.stats['timeout_504_errors']) + "\n")
-            f.write("  Network Errors: " + str(self.stats['network_errors']) + "\n")
-            f.write("  Other Errors: " + str(self.stats['other_errors']) + "\n\n")
-            
-            f.write("Items by category:\n")
-            for category, count in df['category_en'].value_counts().items():
-                cat_ja = self.category_japanese_names.get(category, category)
-                f.write("  " + category + " (" + cat_ja + "): " + str(count) + "\n")
-            
-            f.write("\nLanguage coverage:\n")
-            has_ja = (df['ja_label'].notna() & (df['ja_label'] != '')).sum()
-            ja_pct = round(has_ja/len(df)*100, 1) if len(df) > 0 else 0
-            f.write("  Japanese labels: " + str(has_ja) + " (" + str(ja_pct) + "%)\n")
-            
-            f.write("\nExternal ID coverage:\n")
-            external_ids = [
-                ('mesh_id', 'MeSH'),
-                ('icd10', 'ICD-10'),
-                ('snomed_id', 'SNOMED CT'),
-                ('umls_id', 'UMLS')
-            ]
-            for col, name in external_ids:
-                count = (df[col].notna() & (df[col] != '')).sum()
-                pct = round(count/len(df)*100, 1) if len(df) > 0 else 0
-                f.write("  " + name + ": " + str(count) + " (" + str(pct) + "%)\n")
-        
-        report_msg = "   Report: " + report_file
-        print(report_msg)
-        self.logger.info("Report: " + report_file)
-        
-        print("\nSave completed!\n")
-        self.logger.info("")
-        self.logger.info("All results saved successfully")
+        await asyncio.gather(*tasks)
+        
+        def mb(path):
+            return round(os.path.getsize(path) / (1024 * 1024), 2)
+        
+        log("   Full CSV: %s (%s MB)", full_csv, mb(full_csv))
+        if bilingual_csv:
+            log("   EN-JA pairs CSV: %s (%s pairs, %s MB)", bilingual_csv, len(bilingual_df), mb(bilingual_csv))
+        log("   Category CSVs: %s/ (%s files)", category_dir, cat_count)
+        log("   JSON Lines: %s (%s MB)", json_file, mb(json_file))
+        log("   Parquet: %s (%s MB)", parquet_file, mb(parquet_file))
+        log("   Report: %s", report_file)
+        log("\nSave completed!\n")
         
         return {
             'full_csv': full_csv,
-            'bilingual_csv': bilingual_csv if len(bilingual_df) > 0 else None,
+            'bilingual_csv': bilingual_csv,
             'category_dir': category_dir,
             'json': json_file,
+            'parquet': parquet_file,
             'report': report_file
         }
-
+    
+    def write_report(self, df, quality, report_file, prefix):
+        """Write the plain-text extraction report in a single write"""
+        n = len(df)
+        bilingual_count = len(quality['bilingual'])
+        counts = quality['counts']
+        pct = quality['pct']
+        
+        lines = [
+            "=" * 60,
+            "Wikidata Medical Terms Extraction Report",
+            "=" * 60,
+            "",
+            f"Execution time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Scale: {prefix}",
+            f"Total items: {n}",
+            f"EN-JA pairs: {bilingual_count}",
+        ]
+        if n > 0:
+            lines += [f"Bilingual ratio: {round(bilingual_count / n * 100, 1)}%", ""]
+        
+        lines += [
+            "Statistics:",
+            f"  Total queries: {self.stats['total_queries']}",
+            f"  Successful: {self.stats['successful_queries']}",
+            f"  Failed: {self.stats['failed_queries']}",
+            f"  Retries: {self.stats['total_retries']}",
+            "",
+            "Error Breakdown:",
+            f"  504 Gateway Timeout: {self.stats['timeout_504_errors']}",
+            f"  Network Errors: {self.stats['network_errors']}",
+            f"  Other Errors: {self.stats['other_errors']}",
+            "",
+            "Items by category:",
+        ]
+        lines += [f"  {category} ({self._cat_ja_map[category]}): {count}"
+                  for category, count in quality['cat_counts'].items()]
+        
+        lines += [
+            "",
+            "Language coverage:",
+            f"  Japanese labels: {counts['ja_label']} ({pct['ja_label']}%)",
+            "",
+            "External ID coverage:",
+        ]
+        external_ids = [
+            ('mesh_id', 'MeSH'),
+            ('icd10', 'ICD-10'),
+            ('snomed_id', 'SNOMED CT'),
+            ('umls_id', 'UMLS')
+        ]
+        lines += [f"  {name}: {counts[col]} ({pct[col]}%)"
+                  for col, name in external_ids if col in counts]
+        
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
 
 def parse_arguments():
     """Parse command line arguments"""
@@ -952,6 +1066,9 @@ Examples:
                        help='Only discover categories, do not extract terms')
     parser.add_argument('--discover-limit', type=int, default=100,
                        help='Maximum categories to discover (default: 100)')
+    parser.add_argument('--ids', type=str, default=','.join(EXTERNAL_ID_PROPERTIES),
+                       help='Comma-separated external IDs to fetch (' + ','.join(EXTERNAL_ID_PROPERTIES) +
+                            '; default: all). Fewer IDs means fewer OPTIONAL joins per query')
     
     return parser.parse_args()
 
@@ -984,6 +1101,7 @@ def main():
     print("  Scale: " + size_label + " (" + str(category_count) + " categories)")
     print("  Per category: " + limit_label)
     print("  Batch size: " + str(args.batch_size) + " items")
+    print("  External IDs: " + (args.ids if args.ids else "None"))
     if args.log:
         print("  Log file: " + args.log)
     else:
@@ -1002,10 +1120,18 @@ def main():
     print("Estimated time: " + est_time)
     print("="*60)
     
+    enabled_ids = [k.strip() for k in args.ids.split(',') if k.strip()]
+    unknown_ids = [k for k in enabled_ids if k not in EXTERNAL_ID_PROPERTIES]
+    if unknown_ids:
+        print("Error: Unknown external ID(s): " + ", ".join(unknown_ids))
+        print("Valid choices: " + ", ".join(EXTERNAL_ID_PROPERTIES))
+        return
+    
     extractor = MedicalTermsExtractor(
         batch_size=args.batch_size,
         max_retries=5,
-        log_file=args.log
+        log_file=args.log,
+        enabled_ids=enabled_ids
     )
     
     # Category discovery mode
@@ -1074,21 +1200,20 @@ def main():
     
     df = extractor.extract_all(categories, limit_per_category=limit)
     
-    bilingual_df = extractor.analyze_data_quality(df)
+    quality = extractor.analyze_data_quality(df)
+    bilingual_df = quality['bilingual']
     
     if len(bilingual_df) > 0:
         print("Sample data (EN-JA pairs, first 5):")
         print("="*80)
         sample = bilingual_df[['en_label', 'ja_label', 'category_en']].head()
-        for idx, row in sample.iterrows():
-            en_part = row['en_label'][:30].ljust(30)
-            ja_part = row['ja_label'][:20].ljust(20)
-            cat_part = "[" + row['category_en'] + "]"
-            sample_line = "  " + en_part + " <-> " + ja_part + " " + cat_part
-            print(sample_line)
+        sample_lines = ("  " + sample['en_label'].astype(str).str.slice(0, 30).str.ljust(30)
+                        + " <-> " + sample['ja_label'].astype(str).str.slice(0, 20).str.ljust(20)
+                        + " [" + sample['category_en'].astype(str) + "]")
+        print('\n'.join(sample_lines))
         print("="*80 + "\n")
     
-    files = extractor.save_results(df, prefix=size_name)
+    files = asyncio.run(extractor.save_results(df, prefix=size_name, quality=quality))
     
     print("="*60)
     print("Extraction completed!")
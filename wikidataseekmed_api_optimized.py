@@ -19,21 +19,114 @@ Usage:
 """
 
 from typing import Dict, List, Optional, Any, Tuple, Set
-from SPARQLWrapper import SPARQLWrapper, JSON
+from SPARQLWrapper import SPARQLWrapper, JSON, TSV
 from http.client import IncompleteRead
 from urllib.error import URLError, HTTPError
-from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, field
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import time
+import re
 import socket
+import sys
+import random
+import sqlite3
+import json
+import threading
 import logging
 import traceback
 import argparse
 import yaml
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlencode
+from email.utils import parsedate_to_datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Transport errors raised by whichever HTTP client is in use
+HTTP_ERRORS: Tuple[type, ...] = (requests.RequestException,)
+if httpx is not None:
+    HTTP_ERRORS += (httpx.HTTPError,)
+
+# HTTP status codes that signal server congestion
+CONGESTION_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# maxlag sent with Action API requests, and how many lag deferrals a single
+# request may take (they do not count against max_retries)
+API_MAXLAG = 5
+MAX_LAG_DEFERRALS = 30
+
+# Transport-level retries for failed connection attempts (DNS, refused,
+# TLS setup); these happen before a request is sent, so they are safe for POST
+CONNECT_RETRIES = 3
+
+# Parallel SPARQL queries for independent per-category counts (WDQS allows
+# five concurrent queries per client)
+SPARQL_CONCURRENCY = 3
+
+# Categories per combined label count query; a larger group is more likely
+# to hit the WDQS timeout
+LABEL_COUNT_GROUP_SIZE = 10
+
+# QIDs per WDQS VALUES query when fetching external IDs
+EXTERNAL_ID_BATCH_SIZE = 200
+
+# External ID columns and the Wikidata properties they are read from
+ENTITY_ID_PROPERTIES = {
+    'mesh_id': 'P486',     # MeSH ID
+    'icd10': 'P494',       # ICD-10
+    'icd11': 'P7807',      # ICD-11
+    'icd9': 'P493',        # ICD-9
+    'snomed_id': 'P5806',  # SNOMED CT
+    'umls_id': 'P2892',    # UMLS CUI
+}
+
+# Columns of an extracted term, in DataFrame order
+TERM_COLUMNS = ['qid', 'en_label', 'ja_label', 'en_description', 'ja_description',
+                *ENTITY_ID_PROPERTIES, 'category_en', 'category_ja', 'category_qid']
+
+# Columns of the EN-JA pairs CSV, in file order
+BILINGUAL_COLUMNS = ['qid', 'en_label', 'ja_label', 'category_en', 'category_ja',
+                     'en_description', 'ja_description', *ENTITY_ID_PROPERTIES]
+
+# Rows converted to Arrow and written per step by write_csv_arrow
+CSV_CHUNK_ROWS = 50_000
+
+# Columns whose non-empty share is reported (labels first, then external IDs)
+PRESENCE_COLUMNS = ['en_label', 'ja_label', *ENTITY_ID_PROPERTIES]
+
+# One value per category: stored as pandas categoricals
+CATEGORY_COLUMNS = ['category_en', 'category_ja', 'category_qid']
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 @dataclass
@@ -51,6 +144,15 @@ class QueryStats:
     network_errors: int = 0
     other_errors: int = 0
     entities_fetched_via_api: int = 0
+    duplicate_hits: int = 0
+    lag_deferrals: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **counts: int) -> None:
+        """Add to counters under the lock (SPARQL and API workers share one instance)"""
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
 
     def sparql_reduction_rate(self) -> float:
         """Calculate SPARQL reduction rate compared to old method"""
@@ -94,6 +196,10 @@ class Config:
     save_report: bool
     wikidata_api_url: str
     api_batch_size: int
+    api_concurrency: int = 4
+    save_parquet: bool = True
+    save_feather: bool = False
+    pretty_json: bool = False
 
     @classmethod
     def from_yaml(cls, config_path: str = "config.yaml") -> "Config":
@@ -133,18 +239,297 @@ class Config:
             save_report=data['output']['save_report'],
             wikidata_api_url=data.get('wikidata_api_url', 'https://www.wikidata.org/w/api.php'),
             api_batch_size=data.get('api_batch_size', 50),
+            api_concurrency=data.get('api_concurrency', 4),
+            save_parquet=data['output'].get('save_parquet', True),
+            save_feather=data['output'].get('save_feather', False),
+            pretty_json=data['output'].get('pretty_json', False),
         )
 
 
+def backoff_delay(retry_count: int, base: float, cap: float,
+                  retry_after: Optional[float] = None) -> float:
+    """
+    Delay before the next retry: the server's Retry-After if given,
+    otherwise capped exponential backoff with full jitter
+    """
+    if retry_after is not None:
+        return min(retry_after, cap)
+    return random.uniform(0, min(cap, base * 2 ** retry_count))
+
+
+def write_csv_arrow(df: pd.DataFrame, csv_file: Path,
+                    columns: Optional[List[str]] = None,
+                    row_mask: Optional[Any] = None) -> None:
+    """
+    Write a DataFrame as UTF-8 (BOM) CSV using pyarrow's C++ writer
+
+    `columns` selects and orders the written columns and `row_mask` (boolean
+    array) selects rows; both are applied on the Arrow side, so no filtered
+    DataFrame is built first. Rows are converted and written CSV_CHUNK_ROWS
+    at a time, so the Arrow copy never holds the whole frame.
+    """
+    # The first chunk fixes the schema (an empty slice would type object
+    # columns as null); later chunks are converted to the same schema
+    first = pa.Table.from_pandas(df.iloc[:CSV_CHUNK_ROWS], columns=columns, preserve_index=False)
+    schema = first.schema
+
+    with open(csv_file, 'wb') as f:
+        f.write(b'\xef\xbb\xbf')  # BOM so Excel detects UTF-8
+        with pv.CSVWriter(f, schema, write_options=pv.WriteOptions(include_header=True)) as writer:
+            for start in range(0, max(len(df), 1), CSV_CHUNK_ROWS):
+                stop = start + CSV_CHUNK_ROWS
+                table = first if start == 0 else pa.Table.from_pandas(
+                    df.iloc[start:stop], schema=schema, preserve_index=False)
+                if row_mask is not None:
+                    table = table.filter(pa.array(row_mask[start:stop], type=pa.bool_()))
+                writer.write_table(table)
+
+
+def presence_matrix(df: pd.DataFrame) -> np.ndarray:
+    """
+    Boolean (rows x PRESENCE_COLUMNS) matrix of non-empty cells
+
+    Missing values are stored as '' (extract_entity_data fills every column
+    and extract_all never introduces NaN), so one comparison pass is enough.
+    """
+    return df[PRESENCE_COLUMNS].ne('').to_numpy()
+
+
+def _json_default(value: Any) -> Any:
+    """orjson fallback for pandas missing-value scalars"""
+    if value is pd.NA or value is pd.NaT:
+        return None
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def write_json_records(df: pd.DataFrame, json_file: Path, pretty: bool = False) -> None:
+    """
+    Write a DataFrame as a JSON array of records, one record per line
+    (or indented by two spaces with `pretty`)
+
+    Rows are serialized one at a time with orjson and written straight to a
+    binary file, so memory use does not grow with the row count (NaN and
+    pd.NA become null); falls back to pandas without orjson.
+    """
+    if orjson is None:
+        df.to_json(json_file, orient='records', force_ascii=False, indent=2 if pretty else None)
+        return
+
+    columns = list(df.columns)
+    options = orjson.OPT_SERIALIZE_NUMPY
+    if pretty:
+        options |= orjson.OPT_INDENT_2
+    separator = b'\n'
+    with open(json_file, 'wb') as f:
+        f.write(b'[')
+        for row in df.itertuples(index=False, name=None):
+            f.write(separator)
+            f.write(orjson.dumps(dict(zip(columns, row)), default=_json_default, option=options))
+            separator = b',\n'
+        f.write(b'\n]')
+
+
+class TokenBucket:
+    """
+    Thread-safe adaptive token bucket rate limiter
+
+    Allows bursts of up to `capacity` requests, then `refill_rate` requests
+    per second. Callers that run short reserve their token and sleep only
+    for the remaining deficit, so concurrent callers are spaced out evenly.
+
+    The rate adapts to server feedback: each success raises it additively
+    (never above the configured rate), each congestion signal halves it
+    and drains the bucket.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float,
+                 min_rate: Optional[float] = None, increase_step: Optional[float] = None):
+        self.capacity = max(1.0, float(capacity))
+        self.refill_rate = refill_rate
+        self.max_rate = refill_rate
+        base_rate = refill_rate if refill_rate != float('inf') else self.capacity
+        self.min_rate = min_rate if min_rate is not None else base_rate / 10
+        self.increase_step = increase_step if increase_step is not None else base_rate / 20
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.last_congestion: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_interval(cls, capacity: float, interval: float) -> "TokenBucket":
+        """Create a bucket that refills one token every `interval` seconds (0 = unlimited)"""
+        return cls(capacity, 1.0 / interval if interval > 0 else float('inf'))
+
+    def acquire(self, n: float = 1.0) -> float:
+        """Take `n` tokens, sleeping if necessary. Returns the time slept in seconds."""
+        if self.refill_rate == float('inf'):
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            self.tokens -= n
+            wait_time = -self.tokens / self.refill_rate if self.tokens < 0 else 0.0
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    def increase_rate(self) -> None:
+        """Additive increase after a successful request"""
+        with self._lock:
+            if self.refill_rate < self.max_rate:
+                self.refill_rate = min(self.max_rate, self.refill_rate + self.increase_step)
+
+    def decrease_rate(self) -> None:
+        """Multiplicative decrease after a 429/5xx response"""
+        with self._lock:
+            now = time.monotonic()
+            if self.refill_rate == float('inf'):
+                self.refill_rate = self.capacity
+            self.refill_rate = max(self.min_rate, self.refill_rate / 2)
+            self.tokens = 0.0
+            self.last_refill = now
+            self.last_congestion = now
+
+
+class ResponseCache:
+    """
+    Persistent key-value cache for API/SPARQL results (SQLite, thread-safe)
+
+    Values are JSON-serialized (orjson if installed) and expire after `ttl`
+    seconds.
+    """
+
+    def __init__(self, path: Path, ttl: int = 86400):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, created REAL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _dumps(value: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+    @staticmethod
+    def _loads(data: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Return the unexpired cached values for `keys`"""
+        if not keys:
+            return {}
+        min_created = time.time() - self.ttl
+        found = {}
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM cache WHERE created >= ? AND key IN ({placeholders})",
+                    [min_created, *chunk],
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = self._loads(value)
+        return found
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for `key`, or None"""
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        """Store values, replacing existing entries"""
+        if not items:
+            return
+        now = time.time()
+        rows = [(key, self._dumps(value), now) for key, value in items.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, created) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a single value"""
+        self.set_many({key: value})
+
+
 class WikidataAPIClient:
     """Wikidata Action API client for efficient entity data retrieval"""
 
-    def __init__(self, config: Config, logger: logging.Logger):
+    def __init__(self, config: Config, logger: logging.Logger,
+                 cache: Optional[ResponseCache] = None,
+                 stats: Optional[QueryStats] = None):
         self.config = config
         self.logger = logger
+        self.cache = cache
+        self.stats = stats if stats is not None else QueryStats()
         self.api_url = config.wikidata_api_url
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': config.api_user_agent})
+        self.session = self._create_session()
+
+        # Shared by all concurrent API batches; bursts up to the concurrency limit
+        self.api_bucket = TokenBucket.from_interval(config.api_concurrency,
+                                                    config.wait_between_api_calls)
+
+    def _create_session(self) -> Any:
+        """
+        Create the HTTP client: an HTTP/2 httpx client when httpx and h2 are
+        installed (all concurrent batches multiplex over one connection),
+        otherwise a pooled keep-alive requests.Session
+        """
+        max_connections = max(64, self.config.api_concurrency)
+
+        if httpx is not None:
+            try:
+                transport = httpx.HTTPTransport(
+                    http2=True,
+                    retries=CONNECT_RETRIES,
+                    limits=httpx.Limits(max_keepalive_connections=32,
+                                        max_connections=max_connections),
+                )
+                client = httpx.Client(
+                    transport=transport,
+                    headers={
+                        'User-Agent': self.config.api_user_agent,
+                        'Accept-Encoding': 'gzip, deflate',
+                    },
+                    timeout=self.config.api_timeout,
+                )
+                self.logger.debug("HTTP client: httpx (HTTP/2)")
+                return client
+            except ImportError:
+                self.logger.debug("h2 is not installed; falling back to requests")
+
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': self.config.api_user_agent,
+            'Connection': 'keep-alive',
+            'Accept-Encoding': 'gzip, deflate',
+        })
+
+        # Pool large enough that concurrent batch workers never wait for (or
+        # discard) a connection. Only failed connection attempts are retried
+        # here; HTTP errors and timeouts are retried in _request_entities
+        connect_retry = Retry(total=CONNECT_RETRIES, connect=CONNECT_RETRIES, read=0,
+                              status=0, other=0, redirect=False, backoff_factor=0.5)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max_connections,
+                              max_retries=connect_retry, pool_block=False)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        self.logger.debug("HTTP client: requests (HTTP/1.1)")
+        return session
 
     def get_entities(self, qids: List[str], retry_count: int = 0) -> Dict[str, Any]:
         """
@@ -152,7 +537,7 @@ class WikidataAPIClient:
 
         Args:
             qids: List of QIDs (max 50 per request)
-            retry_count: Current retry count
+            retry_count: Attempt number to start counting retries from
 
         Returns:
             Dictionary of entities keyed by QID
@@ -163,43 +548,98 @@ class WikidataAPIClient:
         # Limit to 50 entities per request (API limitation)
         qids = qids[:self.config.api_batch_size]
 
+        if self.cache is None:
+            return self._request_entities(qids, retry_count)
+
+        # Only QIDs missing from the on-disk cache go to the network
+        cached = self.cache.get_many([f"entity:{qid}" for qid in qids])
+        entities = {qid: cached[f"entity:{qid}"] for qid in qids if f"entity:{qid}" in cached}
+        missing = [qid for qid in qids if qid not in entities]
+        self.logger.debug("Entity cache: %d hits, %d misses", len(entities), len(missing))
+
+        if missing:
+            fetched = self._request_entities(missing, retry_count)
+            self.cache.set_many({f"entity:{qid}": entity for qid, entity in fetched.items()})
+            entities.update(fetched)
+
+        return entities
+
+    def _request_entities(self, qids: List[str], retry_count: int = 0) -> Dict[str, Any]:
+        """Call wbgetentities for `qids`, retrying on failure"""
         params = {
             'action': 'wbgetentities',
             'ids': '|'.join(qids),
-            'props': 'labels|descriptions|claims',
+            # Claims are the bulk of an entity; the few external IDs we need
+            # come from a compact WDQS query instead (fetch_external_ids)
+            'props': 'labels|descriptions',
             'languages': 'en|ja',
             'format': 'json',
+            'maxlag': API_MAXLAG,  # Back off when replication lag is high (server etiquette)
         }
 
-        self.logger.debug(f"API Request: Fetching {len(qids)} entities")
+        self.logger.debug("API Request: Fetching %d entities", len(qids))
 
-        try:
-            response = self.session.get(
-                self.api_url,
-                params=params,
-                timeout=self.config.api_timeout
-            )
-            response.raise_for_status()
+        attempt = retry_count
+        lag_deferrals = 0
+        while attempt <= self.config.max_retries:
+            retry_after = None
+            try:
+                self.api_bucket.acquire()
+                # POST keeps the ID list out of the URL, so full batches never
+                # hit URL-length limits
+                response = self.session.post(
+                    self.api_url,
+                    data=params,
+                    timeout=self.config.api_timeout
+                )
+                if response.status_code in CONGESTION_STATUS_CODES:
+                    self.api_bucket.decrease_rate()
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    self.logger.warning("API congestion (HTTP %d), rate lowered to %.2f req/s",
+                                        response.status_code, self.api_bucket.refill_rate)
+                response.raise_for_status()
+
+                # orjson parses the raw bytes without the str decode step
+                data = orjson.loads(response.content) if orjson is not None else response.json()
+
+                if data.get('error', {}).get('code') == 'maxlag' and lag_deferrals < MAX_LAG_DEFERRALS:
+                    # Replica lag: wait as told and try again without using a retry
+                    self.api_bucket.decrease_rate()
+                    lag_deferrals += 1
+                    self.stats.add(lag_deferrals=1)
+                    wait_time = parse_retry_after(response.headers.get('Retry-After'))
+                    wait_time = min(wait_time if wait_time is not None else API_MAXLAG,
+                                    self.config.retry_wait_max)
+                    self.logger.warning(f"Server lagged ({data['error'].get('info', 'maxlag')}); "
+                                        f"waiting {wait_time:.1f}s")
+                    time.sleep(wait_time)
+                    continue
 
-            data = response.json()
+                if data.get('error', {}).get('code') == 'maxlag':
+                    raise ValueError(f"Server still lagged after {lag_deferrals} deferrals")
 
-            if 'entities' not in data:
-                self.logger.error(f"Unexpected API response: {data}")
-                return {}
+                self.api_bucket.increase_rate()
 
-            self.logger.debug(f"API Response: Successfully fetched {len(data['entities'])} entities")
-            return data['entities']
+                if 'entities' not in data:
+                    self.logger.error(f"Unexpected API response: {data}")
+                    return {}
 
-        except (requests.RequestException, ValueError) as e:
-            self.logger.error(f"API request failed: {e}")
+                self.logger.debug("API Response: Successfully fetched %d entities", len(data['entities']))
+                return data['entities']
 
-            if retry_count < self.config.max_retries:
-                wait_time = (retry_count + 1) * self.config.retry_wait_base
-                self.logger.warning(f"Retrying API request after {wait_time}s...")
+            except (*HTTP_ERRORS, ValueError) as e:
+                self.logger.error(f"API request failed: {e}")
+
+                if attempt >= self.config.max_retries:
+                    raise
+
+                wait_time = backoff_delay(attempt, self.config.retry_wait_base,
+                                          self.config.retry_wait_max, retry_after)
+                self.logger.warning(f"Retrying API request after {wait_time:.1f}s...")
                 time.sleep(wait_time)
-                return self.get_entities(qids, retry_count + 1)
+                attempt += 1
 
-            raise
+        return {}
 
     def extract_entity_data(self, entity: Dict[str, Any], qid: str) -> Dict[str, str]:
         """
@@ -212,81 +652,102 @@ class WikidataAPIClient:
         Returns:
             Dictionary with extracted fields
         """
+        labels = entity.get('labels', {})
+        descriptions = entity.get('descriptions', {})
+
         result = {
             'qid': qid,
-            'en_label': '',
-            'ja_label': '',
-            'en_description': '',
-            'ja_description': '',
-            'mesh_id': '',
-            'icd10': '',
-            'icd11': '',
-            'icd9': '',
-            'snomed_id': '',
-            'umls_id': '',
+            'en_label': labels.get('en', {}).get('value', ''),
+            'ja_label': labels.get('ja', {}).get('value', ''),
+            'en_description': descriptions.get('en', {}).get('value', ''),
+            'ja_description': descriptions.get('ja', {}).get('value', ''),
         }
 
-        # Extract labels
-        if 'labels' in entity:
-            if 'en' in entity['labels']:
-                result['en_label'] = entity['labels']['en'].get('value', '')
-            if 'ja' in entity['labels']:
-                result['ja_label'] = entity['labels']['ja'].get('value', '')
-
-        # Extract descriptions
-        if 'descriptions' in entity:
-            if 'en' in entity['descriptions']:
-                result['en_description'] = entity['descriptions']['en'].get('value', '')
-            if 'ja' in entity['descriptions']:
-                result['ja_description'] = entity['descriptions']['ja'].get('value', '')
+        # Entities are fetched without claims; fetch_external_ids fills in
+        # the IDs it finds later
+        result.update(dict.fromkeys(ENTITY_ID_PROPERTIES, ''))
 
-        # Extract external IDs from claims
-        if 'claims' in entity:
-            claims = entity['claims']
+        return result
 
-            # MeSH ID (P486)
-            if 'P486' in claims:
-                result['mesh_id'] = self._extract_claim_value(claims['P486'])
 
-            # ICD-10 (P494)
-            if 'P494' in claims:
-                result['icd10'] = self._extract_claim_value(claims['P494'])
+# QID format check, compiled once
+_QID_RE = re.compile(r'^Q\d+$')
 
-            # ICD-11 (P7807)
-            if 'P7807' in claims:
-                result['icd11'] = self._extract_claim_value(claims['P7807'])
+# SPARQL query templates, filled with str.format (literal braces are doubled)
+_DISCOVERY_TEMPLATE = """
+        SELECT DISTINCT ?category ?enLabel ?jaLabel WHERE {{
+          ?category wdt:P31 wd:Q4167836 .
+          ?category rdfs:label ?enLabel FILTER(LANG(?enLabel) = "en") .
+          OPTIONAL {{ ?category rdfs:label ?jaLabel FILTER(LANG(?jaLabel) = "ja") }}
+          FILTER({filter_clause})
+        }}
+        LIMIT {limit}
+        """
 
-            # ICD-9 (P493)
-            if 'P493' in claims:
-                result['icd9'] = self._extract_claim_value(claims['P493'])
+_QID_LIST_TEMPLATE = """
+        SELECT DISTINCT ?item (BOUND(?en) AS ?hasEn) (BOUND(?ja) AS ?hasJa) WHERE {{
+          ?item wdt:P31/wdt:P279* wd:{cat} .{exclusion_filters}
+          OPTIONAL {{ ?item rdfs:label ?en FILTER(LANG(?en) = "en") }}
+          OPTIONAL {{ ?item rdfs:label ?ja FILTER(LANG(?ja) = "ja") }}
+        }}
+        LIMIT {limit}
+        OFFSET {offset}
+        """
 
-            # SNOMED CT (P5806)
-            if 'P5806' in claims:
-                result['snomed_id'] = self._extract_claim_value(claims['P5806'])
+_EXTERNAL_IDS_TEMPLATE = """
+        SELECT ?item {id_vars} WHERE {{
+          VALUES ?item {{ {values} }}{id_optionals}
+        }}
+        """
 
-            # UMLS CUI (P2892)
-            if 'P2892' in claims:
-                result['umls_id'] = self._extract_claim_value(claims['P2892'])
+_EXTERNAL_ID_OPTIONAL_TEMPLATE = """
+          OPTIONAL {{ ?item wdt:{prop} ?{col} }}"""
 
-        return result
+_EXCLUSION_TEMPLATE = """
+          FILTER NOT EXISTS {{
+            ?item wdt:P31/wdt:P279* wd:{qid} .
+          }}"""
 
-    def _extract_claim_value(self, claims: List[Dict]) -> str:
-        """Extract the first value from a claim"""
-        if not claims or len(claims) == 0:
-            return ''
+_VALIDATION_TEMPLATE = """
+        ASK {{
+          wd:{qid} wdt:P31 wd:Q4167836 .
+        }}
+        """
 
-        try:
-            mainsnak = claims[0].get('mainsnak', {})
-            datavalue = mainsnak.get('datavalue', {})
-            value = datavalue.get('value', '')
+_COUNT_TEMPLATE = """
+        SELECT (COUNT(DISTINCT ?item) AS ?total)
+        WHERE {{
+          ?item wdt:P31/wdt:P279* wd:{cat} .
+        }}
+        """
 
-            if isinstance(value, dict):
-                # For entity references, etc.
-                return str(value.get('id', ''))
+_LABEL_COUNTS_TEMPLATE = """
+        SELECT (COUNT(*) AS ?total)
+               (SUM(IF(BOUND(?enLabel),1,0)) AS ?enCount)
+               (SUM(IF(BOUND(?jaLabel),1,0)) AS ?jaCount)
+        WHERE {{
+          SELECT ?item (SAMPLE(?en) AS ?enLabel) (SAMPLE(?ja) AS ?jaLabel) WHERE {{
+            ?item wdt:P31/wdt:P279* wd:{cat} .
+            OPTIONAL {{ ?item rdfs:label ?en FILTER(LANG(?en) = "en") }}
+            OPTIONAL {{ ?item rdfs:label ?ja FILTER(LANG(?ja) = "ja") }}
+          }} GROUP BY ?item
+        }}
+        """
 
-            return str(value)
-        except (KeyError, IndexError, AttributeError):
-            return ''
+_LABEL_COUNTS_BATCH_TEMPLATE = """
+        SELECT ?cat (COUNT(*) AS ?total)
+               (SUM(IF(BOUND(?enLabel),1,0)) AS ?enCount)
+               (SUM(IF(BOUND(?jaLabel),1,0)) AS ?jaCount)
+        WHERE {{
+          SELECT ?cat ?item (SAMPLE(?en) AS ?enLabel) (SAMPLE(?ja) AS ?jaLabel) WHERE {{
+            VALUES ?cat {{ {values} }}
+            ?item wdt:P31/wdt:P279* ?cat .
+            OPTIONAL {{ ?item rdfs:label ?en FILTER(LANG(?en) = "en") }}
+            OPTIONAL {{ ?item rdfs:label ?ja FILTER(LANG(?ja) = "ja") }}
+          }} GROUP BY ?cat ?item
+        }}
+        GROUP BY ?cat
+        """
 
 
 class SPARQLQueryBuilder:
@@ -299,23 +760,15 @@ class SPARQLQueryBuilder:
         filter_clauses = [f'CONTAINS(LCASE(?enLabel), "{kw}")' for kw in safe_keywords]
         filter_clause = " || ".join(filter_clauses)
 
-        query = f"""
-        SELECT DISTINCT ?category ?enLabel ?jaLabel WHERE {{
-          ?category wdt:P31 wd:Q4167836 .
-          ?category rdfs:label ?enLabel FILTER(LANG(?enLabel) = "en") .
-          OPTIONAL {{ ?category rdfs:label ?jaLabel FILTER(LANG(?jaLabel) = "ja") }}
-          FILTER({filter_clause})
-        }}
-        LIMIT {int(limit)}
-        """
-        return query
+        return _DISCOVERY_TEMPLATE.format(filter_clause=filter_clause, limit=int(limit))
 
     @staticmethod
     def build_qid_list_query(category_qid: str, batch_size: int, offset: int,
                             exclude_qids: Optional[List[str]] = None) -> str:
         """
-        Build query to get QID list only (no labels/descriptions)
-        This is much faster than fetching all data via SPARQL
+        Build query to get the QID list plus en/ja label presence flags
+        This is much faster than fetching all data via SPARQL, and the
+        flags make a separate label-count traversal unnecessary
 
         Note: Does NOT require labels - includes all items
               Missing labels can be filled later using LLM
@@ -329,24 +782,21 @@ class SPARQLQueryBuilder:
         if not SPARQLQueryBuilder._is_valid_qid(category_qid):
             raise ValueError(f"Invalid QID format: {category_qid}")
 
-        # Build exclusion filters
-        exclusion_filters = ""
-        if exclude_qids:
-            for exclude_qid in exclude_qids:
-                if SPARQLQueryBuilder._is_valid_qid(exclude_qid):
-                    exclusion_filters += f"""
-          FILTER NOT EXISTS {{
-            ?item wdt:P31/wdt:P279* wd:{exclude_qid} .
-          }}"""
+        return _QID_LIST_TEMPLATE.format(
+            cat=category_qid,
+            exclusion_filters=SPARQLQueryBuilder._build_exclusion_filters(exclude_qids),
+            limit=int(batch_size),
+            offset=int(offset),
+        )
 
-        query = f"""
-        SELECT DISTINCT ?item WHERE {{
-          ?item wdt:P31/wdt:P279* wd:{category_qid} .{exclusion_filters}
-        }}
-        LIMIT {int(batch_size)}
-        OFFSET {int(offset)}
-        """
-        return query
+    @staticmethod
+    def _build_exclusion_filters(exclude_qids: Optional[List[str]]) -> str:
+        """Build FILTER NOT EXISTS clauses for excluded sub-categories"""
+        if not exclude_qids:
+            return ""
+        return "".join(_EXCLUSION_TEMPLATE.format(qid=exclude_qid)
+                       for exclude_qid in exclude_qids
+                       if SPARQLQueryBuilder._is_valid_qid(exclude_qid))
 
     @staticmethod
     def build_category_validation_query(qid: str) -> str:
@@ -362,12 +812,7 @@ class SPARQLQueryBuilder:
         if not SPARQLQueryBuilder._is_valid_qid(qid):
             raise ValueError(f"Invalid QID format: {qid}")
 
-        query = f"""
-        ASK {{
-          wd:{qid} wdt:P31 wd:Q4167836 .
-        }}
-        """
-        return query
+        return _VALIDATION_TEMPLATE.format(qid=qid)
 
     @staticmethod
     def build_label_count_query(category_qid: str) -> str:
@@ -375,13 +820,38 @@ class SPARQLQueryBuilder:
         if not SPARQLQueryBuilder._is_valid_qid(category_qid):
             raise ValueError(f"Invalid QID format: {category_qid}")
 
-        query = f"""
-        SELECT (COUNT(DISTINCT ?item) AS ?total)
-        WHERE {{
-          ?item wdt:P31/wdt:P279* wd:{category_qid} .
-        }}
-        """
-        return query
+        return _COUNT_TEMPLATE.format(cat=category_qid)
+
+    @staticmethod
+    def build_label_breakdown_query(category_qid: str) -> str:
+        """Build query to count items and their en/ja labels in category"""
+        if not SPARQLQueryBuilder._is_valid_qid(category_qid):
+            raise ValueError(f"Invalid QID format: {category_qid}")
+
+        return _LABEL_COUNTS_TEMPLATE.format(cat=category_qid)
+
+    @staticmethod
+    def build_label_breakdown_batch_query(category_qids: List[str]) -> str:
+        """Build one query counting items and en/ja labels for several categories"""
+        for qid in category_qids:
+            if not SPARQLQueryBuilder._is_valid_qid(qid):
+                raise ValueError(f"Invalid QID format: {qid}")
+
+        return _LABEL_COUNTS_BATCH_TEMPLATE.format(values=' '.join(f'wd:{qid}' for qid in category_qids))
+
+    @staticmethod
+    def build_external_ids_query(qids: List[str]) -> str:
+        """Build query returning the external-ID properties for known QIDs"""
+        for qid in qids:
+            if not SPARQLQueryBuilder._is_valid_qid(qid):
+                raise ValueError(f"Invalid QID format: {qid}")
+
+        return _EXTERNAL_IDS_TEMPLATE.format(
+            id_vars=' '.join(f'?{col}' for col in ENTITY_ID_PROPERTIES),
+            values=' '.join(f'wd:{qid}' for qid in qids),
+            id_optionals=''.join(_EXTERNAL_ID_OPTIONAL_TEMPLATE.format(prop=prop, col=col)
+                                 for col, prop in ENTITY_ID_PROPERTIES.items()),
+        )
 
     @staticmethod
     def _sanitize_keyword(keyword: str) -> str:
@@ -391,29 +861,74 @@ class SPARQLQueryBuilder:
     @staticmethod
     def _is_valid_qid(qid: str) -> bool:
         """Validate QID format"""
-        import re
-        return bool(re.match(r'^Q\d+$', qid))
+        return _QID_RE.match(qid) is not None
 
 
 class MedicalTermsExtractor:
     """Extract medical terms with optimized API usage"""
 
-    def __init__(self, config: Config, log_file: Optional[str] = None):
+    def __init__(self, config: Config, log_file: Optional[str] = None,
+                 use_cache: bool = True, cache_ttl: int = 86400):
         """Initialize extractor"""
         self.config = config
         self.stats = QueryStats()
 
-        # SPARQL client (minimal usage)
-        self.sparql = SPARQLWrapper(config.api_endpoint)
-        self.sparql.setReturnFormat(JSON)
-        self.sparql.addCustomHttpHeader("User-Agent", config.api_user_agent)
-        self.sparql.setTimeout(config.api_timeout)
+        # Extracted entity data by QID, shared across categories within a run
+        self._entity_memo: Dict[str, Dict[str, str]] = {}
+
+        # (total, en, ja) label counts per category, filled by get_category_qids
+        self.category_label_counts: Dict[str, Tuple[int, int, int]] = {}
+
+        # (has_en, has_ja) per discovered QID, used to plan --target-lang runs
+        self.qid_label_flags: Dict[str, Tuple[bool, bool]] = {}
+
+        # Persistent cache for entity data and category counts across runs
+        self.cache = None
+        if use_cache:
+            self.cache = ResponseCache(Path(config.output_directory) / ".wbcache.sqlite", ttl=cache_ttl)
+
+        # SPARQL clients (minimal usage). SPARQLWrapper keeps the query on the
+        # client object, so JSON queries get one client per thread
+        self._sparql_local = threading.local()
+
+        # Separate client for streamed TSV results (QID lists, prefetch thread only)
+        self.sparql_tsv = self._new_sparql_client(TSV)
 
         # Setup logging
         self.logger = self._setup_logging(log_file)
 
+        # User-facing progress lines: printed to stdout and, through the
+        # parent logger, also recorded in the log file
+        self.console = logging.getLogger('WikidataExtractor.console')
+        self.console.setLevel(logging.INFO)
+        if not self.console.handlers:
+            sh = logging.StreamHandler(sys.stdout)
+            sh.setFormatter(logging.Formatter('%(message)s'))
+            self.console.addHandler(sh)
+
         # Wikidata API client
-        self.api_client = WikidataAPIClient(config, self.logger)
+        self.api_client = WikidataAPIClient(config, self.logger, self.cache, self.stats)
+
+        # SPARQL endpoint rate limit (separate from the Action API budget).
+        # The long-run rate is one query per wait_between_batches; the burst
+        # lets the SPARQL_CONCURRENCY parallel count queries start together
+        self.sparql_bucket = TokenBucket.from_interval(SPARQL_CONCURRENCY, config.wait_between_batches)
+
+    def _new_sparql_client(self, return_format: str) -> SPARQLWrapper:
+        """Create a SPARQL client with the configured endpoint and headers"""
+        client = SPARQLWrapper(self.config.api_endpoint)
+        client.setReturnFormat(return_format)
+        client.addCustomHttpHeader("User-Agent", self.config.api_user_agent)
+        client.setTimeout(self.config.api_timeout)
+        return client
+
+    @property
+    def sparql(self) -> SPARQLWrapper:
+        """JSON SPARQL client of the calling thread"""
+        client = getattr(self._sparql_local, 'client', None)
+        if client is None:
+            client = self._sparql_local.client = self._new_sparql_client(JSON)
+        return client
 
     def _setup_logging(self, log_file: Optional[str]) -> logging.Logger:
         """Setup logging"""
@@ -455,29 +970,40 @@ class MedicalTermsExtractor:
     def execute_sparql_with_retry(self, query: str, context: str = "",
                                   retry_count: int = 0) -> Dict[str, Any]:
         """Execute SPARQL query with retry"""
-        self.stats.total_sparql_queries += 1
+        for attempt in range(retry_count, self.config.max_retries + 1):
+            self.stats.add(total_sparql_queries=1)
 
-        self.logger.info(f"SPARQL Query [{context}]")
-        self.logger.debug(f"Query:\n{query}")
+            self.logger.info("SPARQL Query [%s]", context)
+            self.logger.debug("Query:\n%s", query)
 
-        try:
-            self.sparql.setQuery(query)
-            results = self.sparql.query().convert()
-            self.stats.successful_sparql += 1
-            return results
+            try:
+                self.sparql_bucket.acquire()
+                sparql = self.sparql
+                sparql.setQuery(query)
+                results = sparql.query().convert()
+                self.sparql_bucket.increase_rate()
+                self.stats.add(successful_sparql=1)
+                return results
 
-        except Exception as e:
-            self.stats.failed_sparql += 1
-            self.logger.error(f"SPARQL error: {e}")
+            except Exception as e:
+                self.stats.add(failed_sparql=1)
+                self.logger.error("SPARQL error: %s", e)
+
+                retry_after = None
+                if isinstance(e, HTTPError) and e.code in CONGESTION_STATUS_CODES:
+                    self.sparql_bucket.decrease_rate()
+                    retry_after = parse_retry_after(e.headers.get('Retry-After') if e.headers else None)
 
-            if retry_count < self.config.max_retries:
-                self.stats.total_retries += 1
-                wait_time = (retry_count + 1) * self.config.retry_wait_base
-                self.logger.warning(f"Retrying SPARQL after {wait_time}s...")
+                if attempt >= self.config.max_retries:
+                    raise
+
+                self.stats.add(total_retries=1)
+                wait_time = backoff_delay(attempt, self.config.retry_wait_base,
+                                          self.config.retry_wait_max, retry_after)
+                self.logger.warning(f"Retrying SPARQL after {wait_time:.1f}s...")
                 time.sleep(wait_time)
-                return self.execute_sparql_with_retry(query, context, retry_count + 1)
 
-            raise
+        return {}
 
     def validate_category_qid(self, qid: str) -> bool:
         """
@@ -511,29 +1037,107 @@ class MedicalTermsExtractor:
             limit: Maximum number of items to fetch
             exclude_qids: List of QIDs to exclude from results
         """
-        self.logger.info(f"Fetching QID list for category {category_qid}")
+        self.logger.info("Fetching QID list for category %s", category_qid)
         if exclude_qids:
             self.logger.info(f"Excluding {len(exclude_qids)} QIDs: {exclude_qids}")
 
-        all_qids = []
-        offset = 0
-        batch_size = self.config.batch_size
-        consecutive_empty = 0
         effective_limit = limit if limit else 1000000
 
-        while offset < effective_limit:
+        # One query for the whole list, streamed line by line, instead of
+        # re-running the P279* traversal for every LIMIT/OFFSET page
+        try:
+            query = SPARQLQueryBuilder.build_qid_list_query(
+                category_qid, effective_limit, 0, exclude_qids
+            )
+            rows = self._stream_qids_tsv(query, f"QID list (streamed) {category_qid}")
+        except Exception as e:
+            # Each page re-runs the P279* traversal, so this path is slower
+            # than the streamed query; only taken once it has failed
+            self.logger.warning("Streamed QID list for %s failed (%s); "
+                                "falling back to LIMIT/OFFSET pages", category_qid, e)
+            rows = self._get_category_qids_paged(category_qid, effective_limit, exclude_qids)
+
+        # Label coverage comes from the same rows, no separate count query
+        all_qids = [qid for qid, _, _ in rows]
+        en_count = sum(1 for _, has_en, _ in rows if has_en)
+        ja_count = sum(1 for _, _, has_ja in rows if has_ja)
+        self.category_label_counts[category_qid] = (len(all_qids), en_count, ja_count)
+        self.qid_label_flags.update((qid, (has_en, has_ja)) for qid, has_en, has_ja in rows)
+
+        self.logger.info(f"Total QIDs found: {len(all_qids)} (en={en_count}, ja={ja_count})")
+        return all_qids
+
+    def _stream_qids_tsv(self, query: str, context: str = "") -> List[Tuple[str, bool, bool]]:
+        """
+        Run a QID list query as TSV and parse rows as the response streams in
+
+        Throttling responses (429/5xx) slow the SPARQL bucket down and are
+        retried like execute_sparql_with_retry; other errors are raised at once.
+
+        Returns:
+            List of (qid, has_en_label, has_ja_label)
+        """
+        for attempt in range(self.config.max_retries + 1):
+            self.stats.add(total_sparql_queries=1)
+            self.logger.info("SPARQL Query [%s]", context)
+            self.logger.debug("Query:\n%s", query)
+
+            self.sparql_bucket.acquire()
+            self.sparql_tsv.setQuery(query)
             try:
-                remaining = effective_limit - offset
-                current_batch_size = min(batch_size, remaining)
+                response = self.sparql_tsv.query().response
+                rows = []
+                header_skipped = False
+                for raw_line in response:
+                    if not header_skipped:
+                        header_skipped = True  # "?item\t?hasEn\t?hasJa"
+                        continue
+                    line = raw_line.decode('utf-8').strip()
+                    if not line:
+                        continue
+                    fields = line.split('\t')
+                    qid = fields[0].rstrip('>').rsplit('/', 1)[-1]
+                    has_en = len(fields) > 1 and 'true' in fields[1]
+                    has_ja = len(fields) > 2 and 'true' in fields[2]
+                    rows.append((qid, has_en, has_ja))
+            except Exception as e:
+                self.stats.add(failed_sparql=1)
+                throttled = isinstance(e, HTTPError) and e.code in CONGESTION_STATUS_CODES
+                if not throttled or attempt >= self.config.max_retries:
+                    raise
+
+                self.sparql_bucket.decrease_rate()
+                retry_after = parse_retry_after(e.headers.get('Retry-After') if e.headers else None)
+                self.stats.add(total_retries=1)
+                wait_time = backoff_delay(attempt, self.config.retry_wait_base,
+                                          self.config.retry_wait_max, retry_after)
+                self.logger.warning(f"Streamed QID list throttled (HTTP {e.code}); "
+                                    f"retrying after {wait_time:.1f}s...")
+                time.sleep(wait_time)
+                continue
+
+            self.sparql_bucket.increase_rate()
+            self.stats.add(successful_sparql=1)
+            return rows
+
+        return []
+
+    def _get_category_qids_paged(self, category_qid: str, limit: int,
+                                 exclude_qids: Optional[List[str]] = None) -> List[Tuple[str, bool, bool]]:
+        """Page through a category's QIDs with LIMIT/OFFSET queries (fallback path)"""
+        rows = []
+        offset = 0
+        consecutive_empty = 0
 
+        while offset < limit:
+            try:
+                current_batch_size = min(self.config.batch_size, limit - offset)
                 query = SPARQLQueryBuilder.build_qid_list_query(
                     category_qid, current_batch_size, offset, exclude_qids
                 )
-
                 results = self.execute_sparql_with_retry(
                     query, f"QID list offset={offset}"
                 )
-
                 bindings = results["results"]["bindings"]
 
                 if not bindings:
@@ -546,21 +1150,61 @@ class MedicalTermsExtractor:
                 consecutive_empty = 0
 
                 for binding in bindings:
-                    qid = binding['item']['value'].split('/')[-1]
-                    all_qids.append(qid)
+                    rows.append((
+                        binding['item']['value'].split('/')[-1],
+                        binding.get('hasEn', {}).get('value') == 'true',
+                        binding.get('hasJa', {}).get('value') == 'true',
+                    ))
 
                 if len(bindings) < current_batch_size:
                     break
 
                 offset += current_batch_size
-                time.sleep(self.config.wait_between_batches)
 
             except Exception as e:
                 self.logger.error(f"Failed to fetch QID batch at offset {offset}: {e}")
                 break
 
-        self.logger.info(f"Total QIDs found: {len(all_qids)}")
-        return all_qids
+        return rows
+
+    def fetch_external_ids(self, qids: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Fetch the external-ID properties for known QIDs via WDQS VALUES queries
+
+        Returns:
+            Mapping of QID to {column: value} for the ENTITY_ID_PROPERTIES columns
+        """
+        external_ids: Dict[str, Dict[str, str]] = {}
+        missing = qids
+
+        if self.cache is not None:
+            cached = self.cache.get_many([f"ids:{qid}" for qid in qids])
+            external_ids = {qid: cached[f"ids:{qid}"] for qid in qids if f"ids:{qid}" in cached}
+            missing = [qid for qid in qids if qid not in external_ids]
+
+        for i in range(0, len(missing), EXTERNAL_ID_BATCH_SIZE):
+            chunk = missing[i:i + EXTERNAL_ID_BATCH_SIZE]
+            query = SPARQLQueryBuilder.build_external_ids_query(chunk)
+
+            try:
+                results = self.execute_sparql_with_retry(query, f"External IDs ({len(chunk)} items)")
+            except Exception as e:
+                self.logger.error(f"Failed to fetch external IDs for {len(chunk)} items: {e}")
+                continue
+
+            found: Dict[str, Dict[str, str]] = {qid: {} for qid in chunk}
+            for binding in results['results']['bindings']:
+                ids = found.setdefault(binding['item']['value'].split('/')[-1], {})
+                # Items with several values for a property yield several rows; keep the first
+                for col in ENTITY_ID_PROPERTIES:
+                    if col in binding and col not in ids:
+                        ids[col] = binding[col]['value']
+
+            if self.cache is not None:
+                self.cache.set_many({f"ids:{qid}": ids for qid, ids in found.items()})
+            external_ids.update(found)
+
+        return external_ids
 
     def fetch_entities_via_api(self, qids: List[str], category_name: str,
                                category_qid: str) -> List[Dict[str, str]]:
@@ -568,81 +1212,121 @@ class MedicalTermsExtractor:
         Fetch entity details using Wikidata Action API
         This replaces most SPARQL queries
         """
-        self.logger.info(f"Fetching {len(qids)} entities via Action API")
+        # QIDs already extracted for an earlier category are reused from memory
+        to_fetch = [qid for qid in qids if qid not in self._entity_memo]
+        duplicate_hits = len(qids) - len(to_fetch)
+        self.stats.duplicate_hits += duplicate_hits
 
-        all_terms = []
-        total_batches = (len(qids) + self.config.api_batch_size - 1) // self.config.api_batch_size
+        self.logger.info(f"Fetching {len(to_fetch)} entities via Action API "
+                         f"(concurrency={self.config.api_concurrency}, "
+                         f"{duplicate_hits} already fetched)")
 
-        for i in range(0, len(qids), self.config.api_batch_size):
-            batch_qids = qids[i:i + self.config.api_batch_size]
-            batch_num = i // self.config.api_batch_size + 1
+        batch_size = self.config.api_batch_size
+        batches = [to_fetch[i:i + batch_size] for i in range(0, len(to_fetch), batch_size)]
 
-            print(f"  API batch {batch_num}/{total_batches} ({len(batch_qids)} entities)...", end='\r')
+        # Batches are fetched concurrently; results come back in batch order
+        results = asyncio.run(self._fetch_batches_concurrently(batches)) if batches else []
 
-            try:
-                self.stats.total_api_requests += 1
-                entities = self.api_client.get_entities(batch_qids)
-                self.stats.successful_api += 1
-
-                for qid in batch_qids:
-                    if qid in entities:
-                        entity_data = self.api_client.extract_entity_data(entities[qid], qid)
-                        entity_data['category_en'] = category_name
-                        entity_data['category_ja'] = self.config.category_names_ja.get(
-                            category_name, category_name
-                        )
-                        entity_data['category_qid'] = category_qid
-                        all_terms.append(entity_data)
-                        self.stats.entities_fetched_via_api += 1
-
-                time.sleep(self.config.wait_between_api_calls)
+        for batch_num, (batch_qids, entities) in enumerate(zip(batches, results), 1):
+            self.stats.total_api_requests += 1
 
-            except Exception as e:
+            if isinstance(entities, Exception):
                 self.stats.failed_api += 1
-                self.logger.error(f"API batch {batch_num} failed: {e}")
-                # Continue with next batch
+                self.logger.error(f"API batch {batch_num} failed: {entities}")
+                continue
+
+            self.stats.successful_api += 1
+
+            self._entity_memo.update(entities)
+            self.stats.entities_fetched_via_api += len(entities)
+
+        # External IDs are not in the (claim-less) API response
+        fetched = [qid for qid in to_fetch if qid in self._entity_memo]
+        for qid, ids in self.fetch_external_ids(fetched).items():
+            self._entity_memo[qid].update(ids)
+
+        all_terms = []
+        category_name_ja = self.config.category_names_ja.get(category_name, category_name)
+
+        for qid in qids:
+            if qid in self._entity_memo:
+                entity_data = dict(self._entity_memo[qid])
+                entity_data['category_en'] = category_name
+                entity_data['category_ja'] = category_name_ja
+                entity_data['category_qid'] = category_qid
+                all_terms.append(entity_data)
 
-        print()  # Clear progress line
         self.stats.total_items += len(all_terms)
         return all_terms
 
+    def _fetch_and_extract(self, batch_qids: List[str]) -> Dict[str, Dict[str, str]]:
+        """Fetch one API batch and extract its entities in the worker thread"""
+        entities = self.api_client.get_entities(batch_qids)
+        extract = self.api_client.extract_entity_data
+        return {qid: extract(entities[qid], qid) for qid in batch_qids if qid in entities}
+
+    async def _fetch_batches_concurrently(self, batches: List[List[str]]) -> List[Any]:
+        """
+        Fetch API batches with at most `api_concurrency` requests in flight
+
+        Returns:
+            One entry per batch: the extracted entities by QID, or the
+            exception it raised
+        """
+        semaphore = asyncio.Semaphore(max(1, self.config.api_concurrency))
+        total_batches = len(batches)
+        completed = 0
+
+        async def fetch(batch_qids: List[str]) -> Dict[str, Any]:
+            nonlocal completed
+            async with semaphore:
+                entities = await asyncio.to_thread(self._fetch_and_extract, batch_qids)
+            completed += 1
+            print(f"  API batch {completed}/{total_batches} ({len(batch_qids)} entities)...", end='\r')
+            return entities
+
+        results = await asyncio.gather(*(fetch(b) for b in batches), return_exceptions=True)
+        print()  # Clear progress line
+        return results
+
     def get_category_count(self, category_qid: str) -> int:
         """Get total count of items in category"""
+        cache_key = f"count:{category_qid}"
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             query = SPARQLQueryBuilder.build_label_count_query(category_qid)
             results = self.execute_sparql_with_retry(query, f"Count {category_qid}")
             bindings = results["results"]["bindings"]
 
-            if bindings:
-                return int(bindings[0]["total"]["value"])
-
-            return 0
+            count = int(bindings[0]["total"]["value"]) if bindings else 0
+            if self.cache is not None:
+                self.cache.set(cache_key, count)
+            return count
         except Exception as e:
             self.logger.error(f"Failed to get count for {category_qid}: {e}")
             return 0
 
-    def get_label_counts(self, category_qid: str) -> Tuple[int, int, int]:
+    def get_label_counts(self, category_qid: str) -> Optional[Tuple[int, int, int]]:
         """
         Get detailed label counts for items in category
 
         Returns:
-            Tuple of (total, en_count, ja_count)
+            Tuple of (total, en_count, ja_count), or None if the query failed
         """
         if not SPARQLQueryBuilder._is_valid_qid(category_qid):
             raise ValueError(f"Invalid QID format: {category_qid}")
 
-        query = f"""
-        SELECT (COUNT(*) AS ?total)
-               (SUM(IF(BOUND(?enLabel),1,0)) AS ?enCount)
-               (SUM(IF(BOUND(?jaLabel),1,0)) AS ?jaCount)
-        WHERE {{
-          SELECT ?item (SAMPLE(?en) AS ?enLabel) (SAMPLE(?ja) AS ?jaLabel) WHERE {{
-            ?item wdt:P31/wdt:P279* wd:{category_qid} .
-            OPTIONAL {{ ?item rdfs:label ?en FILTER(LANG(?en) = "en") }}
-            OPTIONAL {{ ?item rdfs:label ?ja FILTER(LANG(?ja) = "ja") }}
-          }} GROUP BY ?item
-        }}
-        """
+        cache_key = f"label_counts:{category_qid}"
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return tuple(cached)
+
+        query = SPARQLQueryBuilder.build_label_breakdown_query(category_qid)
 
         try:
             results = self.execute_sparql_with_retry(query, f"Label counts {category_qid}")
@@ -655,16 +1339,106 @@ class MedicalTermsExtractor:
             en = int(bindings[0]["enCount"]["value"])
             ja = int(bindings[0]["jaCount"]["value"])
 
+            if self.cache is not None:
+                self.cache.set(cache_key, [total, en, ja])
             return (total, en, ja)
         except Exception as e:
             self.logger.error(f"Failed to get label counts for {category_qid}: {e}")
-            return (0, 0, 0)
+            return None
+
+    def get_label_counts_batch(self, category_qids: List[str]) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Get label counts for several categories, LABEL_COUNT_GROUP_SIZE
+        categories per SPARQL query
+
+        Each combined query is tried once, without retries; the categories
+        of a failed group are counted with one get_label_counts() call each.
+        Categories whose count failed are left out.
+
+        Returns:
+            Mapping of category QID to (total, en_count, ja_count)
+        """
+        counts: Dict[str, Tuple[int, int, int]] = {}
+        missing = category_qids
+
+        if self.cache is not None:
+            cached = self.cache.get_many([f"label_counts:{qid}" for qid in category_qids])
+            counts = {qid: tuple(cached[f"label_counts:{qid}"])
+                      for qid in category_qids if f"label_counts:{qid}" in cached}
+            missing = [qid for qid in category_qids if qid not in counts]
+
+        if not missing:
+            return counts
+
+        failed: List[str] = []
+        for start in range(0, len(missing), LABEL_COUNT_GROUP_SIZE):
+            group = missing[start:start + LABEL_COUNT_GROUP_SIZE]
+            try:
+                query = SPARQLQueryBuilder.build_label_breakdown_batch_query(group)
+                # Starting at the last attempt means a single try
+                results = self.execute_sparql_with_retry(query, f"Label counts ({len(group)} categories)",
+                                                         retry_count=self.config.max_retries)
+            except Exception as e:
+                self.logger.error("Batched label count failed, counting per category: %s", e)
+                failed.extend(group)
+                continue
+
+            # Categories without any items produce no row
+            found = {qid: (0, 0, 0) for qid in group}
+            for binding in results["results"]["bindings"]:
+                found[binding["cat"]["value"].split('/')[-1]] = (
+                    int(binding["total"]["value"]),
+                    int(binding["enCount"]["value"]),
+                    int(binding["jaCount"]["value"]),
+                )
+
+            if self.cache is not None:
+                self.cache.set_many({f"label_counts:{qid}": list(c) for qid, c in found.items()})
+            counts.update(found)
+
+        if failed:
+            counts.update(asyncio.run(self._label_counts_concurrently(failed)))
+
+        return counts
+
+    async def _label_counts_concurrently(self, category_qids: List[str]) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Run get_label_counts() for several categories with at most
+        SPARQL_CONCURRENCY queries in flight
+
+        Returns:
+            Mapping of category QID to counts; failed categories are left out
+        """
+        semaphore = asyncio.Semaphore(SPARQL_CONCURRENCY)
+
+        async def count(qid: str) -> Optional[Tuple[int, int, int]]:
+            async with semaphore:
+                return await asyncio.to_thread(self.get_label_counts, qid)
+
+        results = await asyncio.gather(*(count(qid) for qid in category_qids),
+                                       return_exceptions=True)
+
+        counts = {}
+        for qid, result in zip(category_qids, results):
+            # get_label_counts logs its own query failures and returns None
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to get label counts for {qid}: {result}")
+                continue
+            if result is not None:
+                counts[qid] = result
+        return counts
 
     def fetch_terms_by_category(self, category_qid: str, category_name_en: str,
                                limit: Optional[int] = None,
                                target_lang: Optional[str] = None,
-                               target_min: Optional[int] = None) -> List[Dict[str, str]]:
-        """Fetch medical terms from category - optimized version"""
+                               target_min: Optional[int] = None,
+                               qids: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        """
+        Fetch medical terms from category - optimized version
+
+        If `qids` is given (prefetched by extract_all), the SPARQL discovery
+        step is skipped.
+        """
         category_name_ja = self.config.category_names_ja.get(category_name_en, category_name_en)
 
         # Get exclusion list for this category
@@ -686,9 +1460,15 @@ class MedicalTermsExtractor:
         print("=" * 60)
 
         # Step 1: Get QID list via SPARQL (minimal usage)
-        print(f"  Phase 1: Discovering QIDs via SPARQL...")
-        qids = self.get_category_qids(category_qid, limit, exclude_qids)
+        if qids is None:
+            print(f"  Phase 1: Discovering QIDs via SPARQL...")
+            qids = self.get_category_qids(category_qid, limit, exclude_qids)
+        else:
+            print(f"  Phase 1: QIDs discovered via SPARQL (prefetched)")
         print(f"  Found {len(qids)} QIDs")
+        if category_qid in self.category_label_counts:
+            _, en_count, ja_count = self.category_label_counts[category_qid]
+            print(f"  Label coverage: en={en_count}, ja={ja_count}")
 
         if not qids:
             print("  No QIDs found")
@@ -699,27 +1479,35 @@ class MedicalTermsExtractor:
 
         # If target_lang is specified, process in batches and check threshold
         if target_lang and target_min:
-            all_terms = []
-            count_target = 0
-
-            for i in range(0, len(qids), self.config.api_batch_size):
-                batch_qids = qids[i:i + self.config.api_batch_size]
-                terms_batch = self.fetch_entities_via_api(batch_qids, category_name_en, category_qid)
-
-                for term in terms_batch:
-                    all_terms.append(term)
-                    if target_lang == 'ja' and term.get('ja_label'):
-                        count_target += 1
-                    elif target_lang == 'en' and term.get('en_label'):
-                        count_target += 1
-
-                # Check if we reached the target
-                if count_target >= target_min:
-                    print(f"\n  Target language threshold reached: {count_target} {target_lang} labels")
-                    self.logger.info(f"Target language '{target_lang}' count reached: {count_target}")
+            label_key = f'{target_lang}_label'
+
+            # Discovery already told us which items have the label, so the QID
+            # prefix that reaches the target is fetched in one go (unknown
+            # QIDs are assumed to have it)
+            flag = 0 if target_lang == 'en' else 1
+            known = np.fromiter((self.qid_label_flags.get(qid, (True, True))[flag] for qid in qids),
+                                dtype=bool, count=len(qids))
+            reached = np.cumsum(known) >= target_min
+            end = int(np.argmax(reached)) + 1 if reached.any() else len(qids)
+
+            terms = []
+            start = 0
+            while start < len(qids):
+                terms.extend(self.fetch_entities_via_api(qids[start:end], category_name_en, category_qid))
+
+                # Labels may have changed since discovery: verify on the fetched
+                # data and cut at the exact term that reaches the target
+                has_label = np.fromiter((bool(term[label_key]) for term in terms),
+                                        dtype=bool, count=len(terms))
+                hits = np.cumsum(has_label)
+                if len(terms) and hits[-1] >= target_min:
+                    terms = terms[:int(np.argmax(hits >= target_min)) + 1]
+                    print(f"\n  Target language threshold reached: {target_min} {target_lang} labels")
+                    self.logger.info(f"Target language '{target_lang}' count reached: {target_min}")
                     break
 
-            terms = all_terms
+                # Still short: top up one API batch at a time
+                start, end = end, end + self.config.api_batch_size
         else:
             # Normal processing without target threshold
             terms = self.fetch_entities_via_api(qids, category_name_en, category_qid)
@@ -734,6 +1522,9 @@ class MedicalTermsExtractor:
                    target_min: Optional[int] = None) -> pd.DataFrame:
         """Extract medical terms from all categories"""
         all_terms = []
+        # Items that belong to several categories are kept once (first category wins)
+        seen_qids: Set[str] = set()
+        duplicates_removed = 0
 
         print("\n" + "=" * 60)
         print(f"Medical Terms Extraction: {len(categories)} categories")
@@ -744,54 +1535,73 @@ class MedicalTermsExtractor:
             print(f"Target: Stop when {target_lang} labels >= {target_min}")
         print("=" * 60)
 
-        # Show detailed label counts
-        print("\nLabel coverage per category (pre-check):")
-        for qid, name_en in categories.items():
-            try:
-                total, en, ja = self.get_label_counts(qid)
-                print(f"  - {name_en} ({qid}): total={total}, en={en}, ja={ja}")
-            except Exception as e:
-                print(f"  - {name_en} ({qid}): count failed ({e})")
-        print("=" * 60)
-
         start_time = time.time()
 
-        for idx, (qid, name_en) in enumerate(categories.items(), 1):
-            name_ja = self.config.category_names_ja.get(name_en, name_en)
-            print(f"\n[{idx}/{len(categories)}] {name_en} ({name_ja})")
-
-            terms = self.fetch_terms_by_category(qid, name_en, limit_per_category,
-                                                target_lang=target_lang,
-                                                target_min=target_min)
-            all_terms.extend(terms)
+        category_items = list(categories.items())
+
+        def prefetch_qids(category_qid: str) -> List[str]:
+            exclude_qids = self.config.exclude_qids.get(category_qid, [])
+            return self.get_category_qids(category_qid, limit_per_category, exclude_qids)
+
+        # Single-slot pipeline: the next category's QID list is discovered via
+        # SPARQL in the background while the current category's entities are
+        # fetched through the Action API
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            next_qids = prefetcher.submit(prefetch_qids, category_items[0][0]) if category_items else None
+
+            for idx, (qid, name_en) in enumerate(category_items, 1):
+                name_ja = self.config.category_names_ja.get(name_en, name_en)
+                print(f"\n[{idx}/{len(categories)}] {name_en} ({name_ja})")
+
+                current_qids = next_qids
+                if idx < len(category_items):
+                    next_qids = prefetcher.submit(prefetch_qids, category_items[idx][0])
+
+                terms = self.fetch_terms_by_category(qid, name_en, limit_per_category,
+                                                    target_lang=target_lang,
+                                                    target_min=target_min,
+                                                    qids=current_qids.result())
+                for term in terms:
+                    if term['qid'] in seen_qids:
+                        duplicates_removed += 1
+                        continue
+                    seen_qids.add(term['qid'])
+                    all_terms.append(term)
 
-            if idx < len(categories):
-                time.sleep(self.config.wait_between_categories)
+                if idx < len(categories):
+                    time.sleep(self.config.wait_between_categories)
 
         elapsed_time = time.time() - start_time
 
+        # Label coverage gathered during QID discovery (no extra SPARQL traversal)
+        print("\nLabel coverage per category (discovered items):")
+        for qid, name_en in categories.items():
+            if qid in self.category_label_counts:
+                total, en, ja = self.category_label_counts[qid]
+                print(f"  - {name_en} ({qid}): total={total}, en={en}, ja={ja}")
+
         print("\n" + "=" * 60)
         print("Extraction completed")
-        print(f"Total items: {len(all_terms)}")
+        print(f"Total items: {len(all_terms) + duplicates_removed}")
         print(f"Elapsed time: {elapsed_time/60:.1f} minutes")
         print("=" * 60)
 
-        self._log_extraction_summary(len(all_terms), elapsed_time)
+        self._log_extraction_summary(len(all_terms) + duplicates_removed, elapsed_time)
 
-        df = pd.DataFrame(all_terms)
+        # Fixed column list: pandas skips inferring columns from every dict
+        df = pd.DataFrame.from_records(all_terms, columns=TERM_COLUMNS)
 
         if len(df) == 0:
             print("Warning: No data collected.")
             return df
 
-        # Remove duplicates
-        original_count = len(df)
-        df = df.drop_duplicates(subset=['qid'])
-        duplicates_removed = original_count - len(df)
+        # Integer codes instead of a str pointer per row for masks,
+        # value_counts and the Arrow/Parquet writers
+        df = df.astype({col: 'category' for col in CATEGORY_COLUMNS})
 
         if duplicates_removed > 0:
             print(f"Duplicates removed: {duplicates_removed}")
-            print(f"Unique items: {len(df)}\n")
+            print(f"Unique items: {len(seen_qids)}\n")
 
         return df
 
@@ -812,6 +1622,8 @@ class MedicalTermsExtractor:
         self.logger.info(f"  Successful API: {self.stats.successful_api}")
         self.logger.info(f"  Failed API: {self.stats.failed_api}")
         self.logger.info(f"  Entities via API: {self.stats.entities_fetched_via_api}")
+        self.logger.info(f"  Duplicate QIDs reused: {self.stats.duplicate_hits}")
+        self.logger.info(f"  Lag deferrals (maxlag): {self.stats.lag_deferrals}")
         self.logger.info("")
         reduction = self.stats.sparql_reduction_rate()
         self.logger.info(f"  SPARQL reduction: ~{reduction}% vs old method")
@@ -833,29 +1645,36 @@ class MedicalTermsExtractor:
         print("Data Quality Analysis")
         print("=" * 60 + "\n")
 
-        print(f"1. Total records: {len(df)}")
+        n = len(df)
+
+        # One non-empty mask for every checked column, reduced in a single pass
+        mask = presence_matrix(df)
+        counts = dict(zip(PRESENCE_COLUMNS, mask.sum(axis=0).tolist()))
+        has_en_mask = mask[:, 0]
+        has_ja_mask = mask[:, 1]
+
+        print(f"1. Total records: {n}")
         print(f"   Unique QIDs: {df['qid'].nunique()}")
 
         # Language coverage
         print("\n2. Language Coverage:")
-        has_en = (df['en_label'].notna() & (df['en_label'] != '')).sum()
-        has_ja = (df['ja_label'].notna() & (df['ja_label'] != '')).sum()
-        en_pct = has_en / len(df) * 100
-        ja_pct = has_ja / len(df) * 100
-        print(f"   English labels: {has_en} ({en_pct:.1f}%)")
-        print(f"   Japanese labels: {has_ja} ({ja_pct:.1f}%)")
+        has_en = counts['en_label']
+        has_ja = counts['ja_label']
+        print(f"   English labels: {has_en} ({has_en / n * 100:.1f}%)")
+        print(f"   Japanese labels: {has_ja} ({has_ja / n * 100:.1f}%)")
 
         # Detailed breakdown
-        en_only = len(df[(df['en_label'] != '') & (df['ja_label'] == '')])
-        ja_only = len(df[(df['en_label'] == '') & (df['ja_label'] != '')])
-        both = len(df[(df['en_label'] != '') & (df['ja_label'] != '')])
-        neither = len(df[(df['en_label'] == '') & (df['ja_label'] == '')])
+        both_mask = has_en_mask & has_ja_mask
+        both = int(both_mask.sum())
+        en_only = has_en - both
+        ja_only = has_ja - both
+        neither = n - has_en - has_ja + both
 
         print("\n3. Label Pattern Breakdown:")
-        print(f"   English only: {en_only} ({en_only/len(df)*100:.1f}%)")
-        print(f"   Japanese only: {ja_only} ({ja_only/len(df)*100:.1f}%)")
-        print(f"   Both (bilingual): {both} ({both/len(df)*100:.1f}%)")
-        print(f"   Neither: {neither} ({neither/len(df)*100:.1f}%)")
+        print(f"   English only: {en_only} ({en_only/n*100:.1f}%)")
+        print(f"   Japanese only: {ja_only} ({ja_only/n*100:.1f}%)")
+        print(f"   Both (bilingual): {both} ({both/n*100:.1f}%)")
+        print(f"   Neither: {neither} ({neither/n*100:.1f}%)")
 
         if ja_only > 0:
             print(f"\n   ⚠️  Warning: {ja_only} items have Japanese label but no English label")
@@ -863,7 +1682,7 @@ class MedicalTermsExtractor:
             print(f"   ⚠️  Warning: {neither} items have no labels at all")
 
         # Bilingual pairs
-        bilingual = df[(df['en_label'] != '') & (df['ja_label'] != '')]
+        bilingual = df[both_mask]
 
         # External IDs
         print("\n4. External ID Coverage:")
@@ -876,9 +1695,8 @@ class MedicalTermsExtractor:
             ('umls_id', 'UMLS')
         ]
         for col, name in external_ids:
-            count = (df[col].notna() & (df[col] != '')).sum()
-            pct = count / len(df) * 100
-            print(f"   {name}: {count} ({pct:.1f}%)")
+            count = counts[col]
+            print(f"   {name}: {count} ({count / n * 100:.1f}%)")
 
         print("\n" + "=" * 60 + "\n")
 
@@ -887,93 +1705,142 @@ class MedicalTermsExtractor:
     def save_results(self, df: pd.DataFrame, prefix: str = "small") -> Dict[str, Optional[Path]]:
         """Save results"""
         if len(df) == 0:
-            print("No data to save.")
+            self.console.info("No data to save.")
             return {}
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # One clock reading for the file names and the report header
+        now = time.localtime()
+        timestamp = time.strftime("%Y%m%d_%H%M%S", now)
         output_dir = Path(self.config.output_directory)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        print("Saving results...\n")
-        saved_files = {}
+        def output_path(name: str, ext: str) -> Path:
+            return output_dir / f"{prefix}_{name}_{timestamp}.{ext}"
+
+        self.console.info("Saving results...\n")
+
+        # The presence matrix is computed once and shared with the report
+        presence = presence_matrix(df)
+        bilingual_mask = presence[:, 0] & presence[:, 1]
+        n_pairs = int(bilingual_mask.sum())
+
+        # (key, path, console label, writer); the writers are independent and
+        # I/O-bound, so they run concurrently and report in this order
+        jobs = []
 
         # Full CSV
         if self.config.save_full_csv:
-            full_csv = output_dir / f"{prefix}_medical_terms_api_optimized_{timestamp}.csv"
-            df.to_csv(full_csv, index=False, encoding='utf-8-sig')
-            file_size_mb = full_csv.stat().st_size / (1024 * 1024)
-            print(f"   Full CSV: {full_csv} ({file_size_mb:.2f} MB)")
-            saved_files['full_csv'] = full_csv
+            full_csv = output_path('medical_terms_api_optimized', 'csv')
+            jobs.append(('full_csv', full_csv, "Full CSV", lambda path: write_csv_arrow(df, path)))
 
         # Bilingual CSV
-        bilingual_df = df[(df['en_label'] != '') & (df['ja_label'] != '')].copy()
-        if self.config.save_bilingual_csv and len(bilingual_df) > 0:
-            bilingual_csv = output_dir / f"{prefix}_en_ja_pairs_api_{timestamp}.csv"
-            cols = ['qid', 'en_label', 'ja_label', 'category_en', 'category_ja',
-                   'en_description', 'ja_description',
-                   'mesh_id', 'icd10', 'icd11', 'icd9', 'snomed_id', 'umls_id']
-            bilingual_df[cols].to_csv(bilingual_csv, index=False, encoding='utf-8-sig')
-            print(f"   EN-JA pairs: {bilingual_csv} ({len(bilingual_df)} pairs)")
-            saved_files['bilingual_csv'] = bilingual_csv
+        if self.config.save_bilingual_csv and n_pairs > 0:
+            bilingual_csv = output_path('en_ja_pairs_api', 'csv')
+            jobs.append(('bilingual_csv', bilingual_csv, "EN-JA pairs",
+                         lambda path: write_csv_arrow(df, path, columns=BILINGUAL_COLUMNS,
+                                                      row_mask=bilingual_mask)))
+
+        # Parquet (columnar copy for downstream processing)
+        if self.config.save_parquet:
+            parquet_file = output_path('medical_terms_api', 'parquet')
+            jobs.append(('parquet', parquet_file, "Parquet",
+                         lambda path: df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)))
+
+        # Feather (lz4-compressed columnar copy for fast reloads)
+        if self.config.save_feather:
+            feather_file = output_path('medical_terms_api', 'feather')
+            jobs.append(('feather', feather_file, "Feather",
+                         lambda path: df.reset_index(drop=True).to_feather(path, compression='lz4')))
 
         # JSON
         if self.config.save_json:
-            json_file = output_dir / f"{prefix}_medical_terms_api_{timestamp}.json"
-            df.to_json(json_file, orient='records', force_ascii=False, indent=2)
-            print(f"   JSON: {json_file}")
-            saved_files['json'] = json_file
+            json_file = output_path('medical_terms_api', 'json')
+            jobs.append(('json', json_file, "JSON", lambda path: write_json_records(df, path, pretty=self.config.pretty_json)))
 
         # Report
         if self.config.save_report:
-            report_file = output_dir / f"{prefix}_report_api_{timestamp}.txt"
-            self._save_report(df, report_file, prefix)
-            print(f"   Report: {report_file}")
-            saved_files['report'] = report_file
+            report_file = output_path('report_api', 'txt')
+            jobs.append(('report', report_file, "Report",
+                         lambda path: self._save_report(df, path, prefix, presence, now=now)))
 
-        print("\nSave completed!\n")
+        saved_files = {}
+        show_sizes = self.console.isEnabledFor(logging.INFO)
+        with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as executor:
+            futures = [executor.submit(writer, path) for _, path, _, writer in jobs]
+
+            for (key, path, label, _), future in zip(jobs, futures):
+                future.result()
+                if key == 'bilingual_csv':
+                    self.console.info("   %s: %s (%d pairs)", label, path, n_pairs)
+                elif key in ('json', 'report') or not show_sizes:
+                    self.console.info("   %s: %s", label, path)
+                else:
+                    file_size_mb = path.stat().st_size / (1024 * 1024)
+                    self.console.info("   %s: %s (%.2f MB)", label, path, file_size_mb)
+                saved_files[key] = path
+
+        self.console.info("\nSave completed!\n")
         return saved_files
 
-    def _save_report(self, df: pd.DataFrame, report_file: Path, prefix: str) -> None:
-        """Save report"""
+    def _save_report(self, df: pd.DataFrame, report_file: Path, prefix: str,
+                     presence: Optional[np.ndarray] = None,
+                     now: Optional[time.struct_time] = None) -> None:
+        """Save report (the presence matrix is recomputed when not given)"""
+        if now is None:
+            now = time.localtime()
+        if presence is None:
+            presence = presence_matrix(df)
+
+        total = len(df)
+        counts = dict(zip(PRESENCE_COLUMNS, presence.sum(axis=0).tolist()))
+        has_en = counts['en_label']
+        has_ja = counts['ja_label']
+        bilingual = int((presence[:, 0] & presence[:, 1]).sum())
+
+        lines = [
+            "=" * 60,
+            "Wikidata Medical Terms Extraction Report",
+            "API-Optimized Version",
+            "=" * 60,
+            "",
+            f"Execution time: {time.strftime('%Y-%m-%d %H:%M:%S', now)}",
+            f"Total items: {total}",
+            "",
+            "API Usage:",
+            f"  SPARQL queries: {self.stats.total_sparql_queries}",
+            f"  API requests: {self.stats.total_api_requests}",
+            f"  Entities via API: {self.stats.entities_fetched_via_api}",
+            f"  Duplicate QIDs reused: {self.stats.duplicate_hits}",
+            f"  SPARQL reduction: ~{self.stats.sparql_reduction_rate()}%",
+            "",
+            "Language coverage:",
+            f"  English labels: {has_en} ({has_en/total*100:.1f}%)",
+            f"  Japanese labels: {has_ja} ({has_ja/total*100:.1f}%)",
+            f"  Bilingual pairs: {bilingual} ({bilingual/total*100:.1f}%)",
+            "",
+            "External ID coverage:",
+        ]
+
+        external_ids = [
+            ('mesh_id', 'MeSH'),
+            ('icd10', 'ICD-10'),
+            ('icd11', 'ICD-11'),
+            ('icd9', 'ICD-9'),
+            ('snomed_id', 'SNOMED CT'),
+            ('umls_id', 'UMLS')
+        ]
+        for col, name in external_ids:
+            count = counts[col]
+            pct = count / total * 100 if total > 0 else 0
+            lines.append(f"  {name}: {count} ({pct:.1f}%)")
+
+        lines += ["", "Category breakdown:"]
+        lines += [f"  {category}: {count} items"
+                  for category, count in df['category_en'].value_counts().items()]
+
+        # One buffered write for the whole report
         with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 60 + "\n")
-            f.write("Wikidata Medical Terms Extraction Report\n")
-            f.write("API-Optimized Version\n")
-            f.write("=" * 60 + "\n\n")
-            f.write(f"Execution time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Total items: {len(df)}\n\n")
-
-            f.write("API Usage:\n")
-            f.write(f"  SPARQL queries: {self.stats.total_sparql_queries}\n")
-            f.write(f"  API requests: {self.stats.total_api_requests}\n")
-            f.write(f"  Entities via API: {self.stats.entities_fetched_via_api}\n")
-            f.write(f"  SPARQL reduction: ~{self.stats.sparql_reduction_rate()}%\n\n")
-
-            f.write("Language coverage:\n")
-            has_en = (df['en_label'].notna() & (df['en_label'] != '')).sum()
-            has_ja = (df['ja_label'].notna() & (df['ja_label'] != '')).sum()
-            f.write(f"  English labels: {has_en} ({has_en/len(df)*100:.1f}%)\n")
-            f.write(f"  Japanese labels: {has_ja} ({has_ja/len(df)*100:.1f}%)\n")
-            bilingual = len(df[(df['en_label'] != '') & (df['ja_label'] != '')])
-            f.write(f"  Bilingual pairs: {bilingual} ({bilingual/len(df)*100:.1f}%)\n\n")
-
-            f.write("External ID coverage:\n")
-            external_ids = [
-                ('mesh_id', 'MeSH'),
-                ('icd10', 'ICD-10'),
-                ('icd11', 'ICD-11'),
-                ('icd9', 'ICD-9'),
-                ('snomed_id', 'SNOMED CT'),
-                ('umls_id', 'UMLS')
-            ]
-            for col, name in external_ids:
-                count = (df[col].notna() & (df[col] != '')).sum()
-                pct = count / len(df) * 100 if len(df) > 0 else 0
-                f.write(f"  {name}: {count} ({pct:.1f}%)\n")
-
-            f.write("\nCategory breakdown:\n")
-            for category, count in df['category_en'].value_counts().items():
-                f.write(f"  {category}: {count} items\n")
+            f.write("\n".join(lines) + "\n")
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -1002,6 +1869,11 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument('--target-count', type=int, default=None,
                        help='Threshold count to stop per category when --target-lang is set')
 
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the on-disk entity/count cache')
+    parser.add_argument('--cache-ttl', type=int, default=86400,
+                       help='Cache entry lifetime in seconds (default: 86400)')
+
     return parser.parse_args()
 
 
@@ -1041,6 +1913,7 @@ def main() -> None:
     print(f"  Scale: {size_name} ({len(categories)} categories)")
     print(f"  Limit: {args.limit if args.limit else 'Unlimited'}")
     print(f"  API batch size: {config.api_batch_size} entities/request")
+    print(f"  Cache: {'disabled' if args.no_cache else f'enabled (ttl={args.cache_ttl}s)'}")
     if args.count_only:
         print(f"  Mode: Count-only (no data extraction)")
     if args.target_lang and args.target_count:
@@ -1048,17 +1921,19 @@ def main() -> None:
     print("=" * 60)
 
     # Initialize extractor
-    extractor = MedicalTermsExtractor(config=config, log_file=args.log)
+    extractor = MedicalTermsExtractor(config=config, log_file=args.log,
+                                      use_cache=not args.no_cache, cache_ttl=args.cache_ttl)
 
     # Count-only mode: show per-category counts then exit
     if args.count_only:
         print("\nLabel coverage per category (count-only mode):")
+        label_counts = extractor.get_label_counts_batch(list(categories))
         for qid, name_en in categories.items():
-            try:
-                total, en, ja = extractor.get_label_counts(qid)
+            if qid in label_counts:
+                total, en, ja = label_counts[qid]
                 print(f"  - {name_en} ({qid}): total={total}, en={en}, ja={ja}")
-            except Exception as e:
-                print(f"  - {name_en} ({qid}): count failed ({e})")
+            else:
+                print(f"  - {name_en} ({qid}): count failed")
         print("=" * 60)
         print("Count-only mode: done.")
         return
@@ -15,20 +15,305 @@ Usage:
   python wikidataseekmed_improved.py --medium --limit 5000 --batch-size 500 --log medium.log
 """
 
-from typing import Dict, List, Optional, Any, Tuple
-from SPARQLWrapper import SPARQLWrapper, JSON
-from http.client import IncompleteRead
-from urllib.error import URLError, HTTPError
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Sequence, Tuple
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, field
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, partial
+from itertools import islice
+import asyncio
+import atexit
+import copy
+import csv
+import json
+import re
+import sqlite3
+import sys
 import time
-import socket
+import zlib
+import threading
 import logging
+import queue
 import traceback
+from logging.handlers import QueueHandler, QueueListener
 import argparse
 import yaml
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pandas/pyarrow are imported where they are used, so discovery-only runs
+# start without loading them
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+
+# Wikidata item ID (Q followed by digits, no leading zero)
+_QID_RE = re.compile(r'^Q[1-9]\d*\Z')
+
+# SPARQL result variable -> output column for the per-item values of a batch
+TERM_BINDINGS = [
+    ('enLabel', 'en_label'),
+    ('jaLabel', 'ja_label'),
+    ('enDescription', 'en_description'),
+    ('jaDescription', 'ja_description'),
+    ('meshId', 'mesh_id'),
+    ('icd10', 'icd10'),
+    ('icd11', 'icd11'),
+    ('icd9', 'icd9'),
+    ('snomedId', 'snomed_id'),
+    ('umlsId', 'umls_id'),
+]
+
+# Columns of an extracted term, in output order
+TERM_COLUMNS = ['qid', 'category_en', 'category_ja', 'category_qid',
+                *(col for _, col in TERM_BINDINGS)]
+
+
+# One value per category: stored as pandas categoricals
+CATEGORY_COLUMNS = ['category_en', 'category_ja', 'category_qid']
+
+# External ID columns and their display names in the analysis and report
+EXTERNAL_ID_NAMES = [
+    ('mesh_id', 'MeSH'),
+    ('icd10', 'ICD-10'),
+    ('icd11', 'ICD-11'),
+    ('icd9', 'ICD-9'),
+    ('snomed_id', 'SNOMED CT'),
+    ('umls_id', 'UMLS'),
+]
+
+# Columns whose non-empty share is reported as coverage
+COVERAGE_COLUMNS = ['en_label', 'ja_label', 'en_description', 'ja_description',
+                    *(col for col, _ in EXTERNAL_ID_NAMES)]
+
+# Characters replaced with '_' in per-category file names
+_FN_TR = str.maketrans({'/': '_', '\\': '_', ' ': '_'})
+
+# Rows converted to Arrow and written per CSV chunk
+CSV_CHUNK_ROWS = 50_000
+
+# Categories counted together in one label count query (keeps each query
+# well under the 60 s WDQS timeout)
+LABEL_COUNT_GROUP_SIZE = 10
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def write_csv_arrow(df: pd.DataFrame, csv_file: Path,
+                    columns: Optional[List[str]] = None) -> None:
+    """
+    Write a DataFrame as UTF-8 (BOM) CSV using pyarrow's C++ writer
+    
+    `columns` selects and orders the written columns. Rows are converted and
+    written CSV_CHUNK_ROWS at a time, so the Arrow copy never holds the
+    whole frame.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    
+    # The first chunk fixes the schema (an empty slice would type object
+    # columns as null); later chunks are converted to the same schema
+    first = pa.Table.from_pandas(df.iloc[:CSV_CHUNK_ROWS], columns=columns, preserve_index=False)
+    schema = first.schema
+    
+    with open(csv_file, 'wb') as f:
+        f.write(b'\xef\xbb\xbf')  # BOM so Excel detects UTF-8
+        with pv.CSVWriter(f, schema, write_options=pv.WriteOptions(include_header=True)) as writer:
+            writer.write_table(first)
+            for start in range(CSV_CHUNK_ROWS, len(df), CSV_CHUNK_ROWS):
+                writer.write_table(pa.Table.from_pandas(df.iloc[start:start + CSV_CHUNK_ROWS],
+                                                        schema=schema, preserve_index=False))
+
+
+def coverage_counts(df: pd.DataFrame) -> pd.Series:
+    """Number of non-empty (neither NA nor '') values per COVERAGE_COLUMNS column"""
+    import pandas as pd
+    return df[COVERAGE_COLUMNS].replace('', pd.NA).notna().sum()
+
+
+@lru_cache(maxsize=None)
+def term_schema() -> Any:
+    """Arrow schema of an extracted term: every value is a string ('' when missing)"""
+    import pyarrow as pa
+    return pa.schema([(col, pa.string()) for col in TERM_COLUMNS])
+
+
+def write_json_records(df: pd.DataFrame, json_file: Path) -> None:
+    """
+    Write a DataFrame as an indented JSON array of records (orjson if installed)
+    
+    Records are serialized CSV_CHUNK_ROWS at a time and streamed to the file,
+    so the whole document is never held in memory.
+    """
+    import pandas as pd
+    
+    def na_to_null(obj: Any) -> None:
+        # Missing values of string columns are pd.NA, which orjson rejects
+        if obj is pd.NA:
+            return None
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    
+    def dump(chunk: pd.DataFrame) -> bytes:
+        if orjson is None:
+            return chunk.to_json(orient='records', force_ascii=False, indent=2).encode('utf-8')
+        # orjson writes NaN as null, like pandas; pd.NA goes through default=
+        return orjson.dumps(chunk.to_dict(orient='records'), default=na_to_null,
+                            option=orjson.OPT_INDENT_2)
+    
+    with open(json_file, 'wb') as f:
+        if len(df) == 0:
+            f.write(b'[]')
+            return
+        f.write(b'[\n')
+        for start in range(0, len(df), CSV_CHUNK_ROWS):
+            if start:
+                f.write(b',\n')
+            # Inner records of the chunk's array: drop its "[\n" and "\n]"
+            f.write(dump(df.iloc[start:start + CSV_CHUNK_ROWS])[2:-2])
+        f.write(b'\n]')
+
+
+@lru_cache(maxsize=None)
+def _calc_retry_wait(retry_count: int, error_type: str, base: int, base_504: int,
+                     base_network: int, max_wait: int) -> int:
+    """Retry wait in seconds: exponential for 504/network errors, linear otherwise"""
+    if error_type == '504':
+        wait = min(max_wait, (3 ** retry_count) * base_504)
+    elif error_type == 'network':
+        wait = min(max_wait, (2 ** retry_count) * base_network)
+    else:
+        wait = (retry_count + 1) * base
+    return int(wait)
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by all SPARQL workers
+    
+    Allows bursts of up to `burst` queries, then `rate` queries per second.
+    Server signals (Retry-After, X-RateLimit-Remaining/Reset) pause every
+    worker until the signaled time instead of guessing a backoff.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.last_refill = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """Take one token, sleeping if necessary. Returns the time slept in seconds."""
+        with self._lock:
+            now = time.monotonic()
+            wait_time = max(0.0, self.paused_until - now)
+            if self.rate > 0:
+                self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                self.tokens -= 1
+                if self.tokens < 0:
+                    wait_time = max(wait_time, -self.tokens / self.rate)
+        
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back all workers for `seconds` from now"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+    
+    def observe(self, headers: Any) -> Optional[float]:
+        """
+        Apply rate limit headers of a response
+        
+        Returns:
+            The server-signaled delay in seconds, or None if there is none
+        """
+        delay = parse_retry_after(headers.get('Retry-After'))
+        if delay is None and headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                reset = float(headers.get('X-RateLimit-Reset', ''))
+            except ValueError:
+                reset = None
+            if reset is not None:
+                # Either an epoch timestamp or a delay in seconds
+                delay = max(0.0, reset - time.time()) if reset > 1e9 else reset
+        if delay is not None:
+            self.pause(delay)
+        return delay
+
+
+class BatchCache:
+    """
+    Persistent cache of SPARQL result batches (SQLite, thread-safe)
+    
+    Entries are keyed by (category QID, offset, batch size), stored as
+    zlib-compressed JSON and expire after `ttl` seconds.
+    """
+    
+    def __init__(self, path: Path, ttl: int = 86400):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS batch_cache ("
+            "qid TEXT, offset INT, size INT, fetched_at INT, body BLOB, "
+            "PRIMARY KEY (qid, offset, size))"
+        )
+        self._conn.commit()
+    
+    def get(self, qid: str, offset: int, size: int) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached bindings of a batch, or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM batch_cache WHERE qid = ? AND offset = ? AND size = ? AND fetched_at >= ?",
+                (qid, offset, size, int(time.time()) - self.ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        data = zlib.decompress(row[0])
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    
+    def set(self, qid: str, offset: int, size: int, bindings: List[Dict[str, Any]]) -> None:
+        """Store the bindings of a batch, replacing an existing entry"""
+        if orjson is not None:
+            data = orjson.dumps(bindings)
+        else:
+            data = json.dumps(bindings, ensure_ascii=False).encode('utf-8')
+        body = zlib.compress(data)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO batch_cache (qid, offset, size, fetched_at, body) VALUES (?, ?, ?, ?, ?)",
+                (qid, offset, size, int(time.time()), body),
+            )
+            self._conn.commit()
 
 
 @dataclass
@@ -39,9 +324,17 @@ class QueryStats:
     failed_queries: int = 0
     total_retries: int = 0
     total_items: int = 0
+    duplicate_items: int = 0
     timeout_504_errors: int = 0
     network_errors: int = 0
     other_errors: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
+    def add(self, **counts: int) -> None:
+        """Add to counters under the lock (batch and category workers share one instance)"""
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
     
     def success_rate(self) -> float:
         """Calculate success rate"""
@@ -50,6 +343,13 @@ class QueryStats:
         return round(self.successful_queries / self.total_queries * 100, 1)
 
 
+@lru_cache(maxsize=4)
+def _load_yaml(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML file once per (path, modification time)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
 @dataclass
 class Config:
     """Configuration data class"""
@@ -67,7 +367,7 @@ class Config:
     retry_wait_max: int
     categories: Dict[str, Dict[str, str]]
     category_names_ja: Dict[str, str]
-    medical_keywords: List[str]
+    medical_keywords: Tuple[str, ...]
     discovery_default_limit: int
     discovery_max_limit: int
     output_directory: str
@@ -76,6 +376,11 @@ class Config:
     save_category_csvs: bool
     save_json: bool
     save_report: bool
+    save_parquet: bool = True
+    sparql_concurrency: int = 3
+    max_qps: float = 2.0
+    burst: int = 3
+    max_parallel_categories: int = 1
     
     @classmethod
     def from_yaml(cls, config_path: str = "config.yaml") -> "Config":
@@ -84,8 +389,9 @@ class Config:
         if not config_file.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
-        with open(config_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        # The parsed document is cached; each Config gets its own copy since
+        # discovery adds entries to category_names_ja
+        data = copy.deepcopy(_load_yaml(str(config_file), config_file.stat().st_mtime))
         
         return cls(
             api_endpoint=data['api']['endpoint'],
@@ -102,7 +408,7 @@ class Config:
             retry_wait_max=data['query']['retry_wait_max'],
             categories=data['categories'],
             category_names_ja=data['category_names_ja'],
-            medical_keywords=data['medical_keywords'],
+            medical_keywords=tuple(data['medical_keywords']),
             discovery_default_limit=data['discovery']['default_limit'],
             discovery_max_limit=data['discovery']['max_limit'],
             output_directory=data['output']['directory'],
@@ -111,49 +417,21 @@ class Config:
             save_category_csvs=data['output']['save_category_csvs'],
             save_json=data['output']['save_json'],
             save_report=data['output']['save_report'],
+            save_parquet=data['output'].get('save_parquet', True),
+            sparql_concurrency=data['query'].get('concurrency', 3),
+            max_qps=data['query'].get('max_qps', 2.0),
+            burst=data['query'].get('burst', 3),
+            max_parallel_categories=data['query'].get('max_parallel_categories', 1),
         )
 
 
-class SPARQLQueryBuilder:
-    """SPARQL query builder with parameterization to prevent injection"""
-    
-    @staticmethod
-    def build_discovery_query(keywords: List[str], limit: int) -> str:
-        """Build category discovery query with safe keyword filtering"""
-        # Sanitize keywords to prevent injection
-        safe_keywords = [SPARQLQueryBuilder._sanitize_keyword(kw) for kw in keywords]
-        
-        # Build filter clauses
-        filter_clauses = [f'CONTAINS(LCASE(?enLabel), "{kw}")' for kw in safe_keywords]
-        filter_clause = " || ".join(filter_clauses)
-        
-        query = f"""
-        SELECT DISTINCT ?category ?enLabel ?jaLabel WHERE {{
-          ?category wdt:P31 wd:Q4167836 .
-          ?category rdfs:label ?enLabel FILTER(LANG(?enLabel) = "en") .
-          OPTIONAL {{ ?category rdfs:label ?jaLabel FILTER(LANG(?jaLabel) = "ja") }}
-          FILTER({filter_clause})
-        }}
-        LIMIT {int(limit)}
-        """
-        return query
-    
-    @staticmethod
-    def build_batch_query(category_qid: str, batch_size: int, offset: int) -> str:
-        """Build batch fetch query with safe parameters"""
-        # Validate QID format
-        if not SPARQLQueryBuilder._is_valid_qid(category_qid):
-            raise ValueError(f"Invalid QID format: {category_qid}")
-        
-        # Ensure numeric parameters are integers
-        batch_size = int(batch_size)
-        offset = int(offset)
-        
-        query = f"""
+# SPARQL templates, filled with str.format (literal braces are doubled)
+# Item batch of one category tree: {qid}, {size} (LIMIT), {offset} (OFFSET)
+_BATCH_TEMPLATE = """
         SELECT DISTINCT ?item ?enLabel ?jaLabel ?enDescription ?jaDescription
                ?meshId ?icd10 ?icd11 ?icd9 ?snomedId ?umlsId
         WHERE {{
-          ?item wdt:P31/wdt:P279* wd:{category_qid} .
+          ?item wdt:P31/wdt:P279* wd:{qid} .
 
           OPTIONAL {{
             ?item rdfs:label ?enLabel .
@@ -182,31 +460,96 @@ class SPARQLQueryBuilder:
           OPTIONAL {{ ?item wdt:P5806 ?snomedId }}
           OPTIONAL {{ ?item wdt:P2892 ?umlsId }}
         }}
-        LIMIT {batch_size}
+        LIMIT {size}
         OFFSET {offset}
         """
-        return query
-    
-    @staticmethod
-    def build_label_count_query(category_qid: str) -> str:
-        """Build a query that counts total items and those with EN/JA labels in the category tree"""
-        if not SPARQLQueryBuilder._is_valid_qid(category_qid):
-            raise ValueError(f"Invalid QID format: {category_qid}")
-        
-        query = f"""
+
+# Total / EN / JA label counts of one category tree: {qid}
+_LABEL_COUNT_TEMPLATE = """
         SELECT (COUNT(*) AS ?total)
                (SUM(IF(BOUND(?enLabel),1,0)) AS ?enCount)
                (SUM(IF(BOUND(?jaLabel),1,0)) AS ?jaCount)
         WHERE {{
           SELECT ?item (SAMPLE(?en) AS ?enLabel) (SAMPLE(?ja) AS ?jaLabel) WHERE {{
-            ?item wdt:P31/wdt:P279* wd:{category_qid} .
+            ?item wdt:P31/wdt:P279* wd:{qid} .
             OPTIONAL {{ ?item rdfs:label ?en FILTER(LANG(?en) = "en") }}
             OPTIONAL {{ ?item rdfs:label ?ja FILTER(LANG(?ja) = "ja") }}
           }} GROUP BY ?item
         }}
         """
+
+# Label counts of several category trees, one row per ?cat: {values}
+_LABEL_COUNT_BATCH_TEMPLATE = """
+        SELECT ?cat (COUNT(*) AS ?total)
+               (SUM(IF(BOUND(?enLabel),1,0)) AS ?enCount)
+               (SUM(IF(BOUND(?jaLabel),1,0)) AS ?jaCount)
+        WHERE {{
+          SELECT ?cat ?item (SAMPLE(?en) AS ?enLabel) (SAMPLE(?ja) AS ?jaLabel) WHERE {{
+            VALUES ?cat {{ {values} }}
+            ?item wdt:P31/wdt:P279* ?cat .
+            OPTIONAL {{ ?item rdfs:label ?en FILTER(LANG(?en) = "en") }}
+            OPTIONAL {{ ?item rdfs:label ?ja FILTER(LANG(?ja) = "ja") }}
+          }} GROUP BY ?cat ?item
+        }}
+        GROUP BY ?cat
+        """
+
+
+class SPARQLQueryBuilder:
+    """SPARQL query builder with parameterization to prevent injection"""
+    
+    @staticmethod
+    def build_discovery_query(keywords: Sequence[str], limit: int) -> str:
+        """Build category discovery query with safe keyword filtering"""
+        # Sanitize keywords to prevent injection
+        safe_keywords = [SPARQLQueryBuilder._sanitize_keyword(kw) for kw in keywords]
+        
+        # Build filter clauses
+        filter_clauses = [f'CONTAINS(LCASE(?enLabel), "{kw}")' for kw in safe_keywords]
+        filter_clause = " || ".join(filter_clauses)
+        
+        query = f"""
+        SELECT DISTINCT ?category ?enLabel ?jaLabel WHERE {{
+          ?category wdt:P31 wd:Q4167836 .
+          ?category rdfs:label ?enLabel FILTER(LANG(?enLabel) = "en") .
+          OPTIONAL {{ ?category rdfs:label ?jaLabel FILTER(LANG(?jaLabel) = "ja") }}
+          FILTER({filter_clause})
+        }}
+        LIMIT {int(limit)}
+        """
         return query
     
+    @staticmethod
+    def build_batch_query(category_qid: str, batch_size: int, offset: int) -> str:
+        """Build batch fetch query with safe parameters"""
+        # Validate QID format
+        if not SPARQLQueryBuilder._is_valid_qid(category_qid):
+            raise ValueError(f"Invalid QID format: {category_qid}")
+        
+        # Ensure numeric parameters are integers
+        batch_size = int(batch_size)
+        offset = int(offset)
+        
+        return _BATCH_TEMPLATE.format(qid=category_qid, size=batch_size, offset=offset)
+    
+    @staticmethod
+    def build_label_count_query(category_qid: str) -> str:
+        """Build a query that counts total items and those with EN/JA labels in the category tree"""
+        if not SPARQLQueryBuilder._is_valid_qid(category_qid):
+            raise ValueError(f"Invalid QID format: {category_qid}")
+        
+        return _LABEL_COUNT_TEMPLATE.format(qid=category_qid)
+    
+    @staticmethod
+    def build_label_count_batch_query(category_qids: List[str]) -> str:
+        """Build one label count query for several categories, grouped by ?cat"""
+        for qid in category_qids:
+            if not SPARQLQueryBuilder._is_valid_qid(qid):
+                raise ValueError(f"Invalid QID format: {qid}")
+        
+        values = " ".join(f"wd:{qid}" for qid in category_qids)
+        return _LABEL_COUNT_BATCH_TEMPLATE.format(values=values)
+    
     @staticmethod
     def _sanitize_keyword(keyword: str) -> str:
         """Sanitize keyword to prevent SPARQL injection"""
@@ -216,31 +559,84 @@ class SPARQLQueryBuilder:
     @staticmethod
     def _is_valid_qid(qid: str) -> bool:
         """Validate QID format (Q followed by digits)"""
-        import re
-        return bool(re.match(r'^Q\d+$', qid))
+        return _QID_RE.match(qid) is not None
 
 
 class MedicalTermsExtractor:
     """Extract medical terms from Wikidata with improved error handling and resource management"""
     
-    def __init__(self, config: Config, log_file: Optional[str] = None):
+    def __init__(self, config: Config, log_file: Optional[str] = None,
+                 use_cache: bool = True, cache_ttl: int = 86400):
         """Initialize extractor with configuration"""
         self.config = config
         self.stats = QueryStats()
         
-        # Initialize SPARQL wrapper
-        self.sparql = SPARQLWrapper(config.api_endpoint)
-        self.sparql.setReturnFormat(JSON)
-        self.sparql.addCustomHttpHeader("User-Agent", config.api_user_agent)
-        self.sparql.setTimeout(config.api_timeout)
-        
-        # Setup logging
+        # Persistent cache of fetched batches across runs
+        self.cache = None
+        if use_cache:
+            self.cache = BatchCache(Path(config.output_directory) / ".batchcache.sqlite", ttl=cache_ttl)
+        
+        # One pooled keep-alive session for every SPARQL request, shared by
+        # the concurrent batch workers (retries are handled in
+        # execute_sparql_with_retry)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': config.api_user_agent,
+            'Accept': 'application/sparql-results+json',
+            'Accept-Encoding': 'gzip, deflate',
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.rate_limiter = RateLimiter(config.max_qps, config.burst)
+        
+        # QIDs already collected; items seen in an earlier batch or category
+        # are skipped as they arrive
+        self._seen_qids: set[str] = set()
+        
+        # Categories may be fetched in parallel: guards _seen_qids and the
+        # shared Parquet writer
+        self._terms_lock = threading.Lock()
+        
+        # Results of analyze_data_quality, reused by save_results and the
+        # report for the same DataFrame
+        self._quality: Optional[Dict[str, Any]] = None
+        
+        # Setup logging (file output is written by a background listener)
+        self._log_listener: Optional[QueueListener] = None
         self.logger = self._setup_logging(log_file)
     
+    def _tee(self, msg: str = "") -> None:
+        """Print a line and log the same string at INFO"""
+        print(msg)
+        self.logger.info(msg)
+    
+    def close(self) -> None:
+        """Write out queued log records and stop the log listener"""
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            for handler in self._log_listener.handlers:
+                handler.close()
+            self._log_listener = None
+    
+    def _run_query(self, query: str) -> Dict[str, Any]:
+        """POST a SPARQL query and return the decoded JSON results"""
+        self.rate_limiter.acquire()
+        # POST keeps long queries out of the URL; the session already asks
+        # for gzip, which requests decompresses transparently
+        response = self.session.post(self.config.api_endpoint, data={'query': query, 'format': 'json'},
+                                     timeout=self.config.api_timeout)
+        self.rate_limiter.observe(response.headers)
+        response.raise_for_status()
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+    
     def _setup_logging(self, log_file: Optional[str]) -> logging.Logger:
         """Setup logging with proper resource management"""
         logger = logging.getLogger('WikidataExtractor')
-        logger.setLevel(logging.DEBUG)
+        # Without a log file nothing is written, so skip building INFO/DEBUG records
+        logger.setLevel(logging.DEBUG if log_file else logging.WARNING)
         
         # Remove existing handlers to avoid duplicates
         logger.handlers.clear()
@@ -265,8 +661,13 @@ class MedicalTermsExtractor:
             fh.setFormatter(formatter)
             ch.setFormatter(formatter)
             
-            logger.addHandler(fh)
-            logger.addHandler(ch)
+            # Records are queued by the calling thread and written by the
+            # listener thread, so fetching never waits on file I/O
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            logger.addHandler(QueueHandler(log_queue))
+            self._log_listener = QueueListener(log_queue, fh, ch, respect_handler_level=True)
+            self._log_listener.start()
+            atexit.register(self.close)
             
             logger.info("=" * 60)
             logger.info("Wikidata Medical Terms Extractor - Log Started")
@@ -308,15 +709,17 @@ class MedicalTermsExtractor:
             print(f"\nSearching for medical categories...")
             print(f"Keywords: {', '.join(self.config.medical_keywords[:10])}...")
             
-            self.sparql.setQuery(query)
-            results = self.sparql.query().convert()
+            results = self._run_query(query)
             bindings = results["results"]["bindings"]
             
             print(f"Found {len(bindings)} potential medical categories")
             self.logger.info(f"Found {len(bindings)} categories")
             
+            known_ja = self.config.category_names_ja
+            log_info = self.logger.isEnabledFor(logging.INFO)
+            
             for binding in bindings:
-                qid = binding['category']['value'].split('/')[-1]
+                qid = binding['category']['value'].rpartition('/')[2]
                 en_label = binding.get('enLabel', {}).get('value', '')
                 ja_label = binding.get('jaLabel', {}).get('value', '')
                 
@@ -326,17 +729,17 @@ class MedicalTermsExtractor:
                 
                 discovered[qid] = en_label
                 
-                if ja_label and en_label not in self.config.category_names_ja:
-                    self.config.category_names_ja[en_label] = ja_label
+                if ja_label and en_label not in known_ja:
+                    known_ja[en_label] = ja_label
                 
-                self.logger.info(f"  {qid}: {en_label}" + 
-                               (f" ({ja_label})" if ja_label else ""))
+                if log_info:
+                    self.logger.info("  %s: %s%s", qid, en_label, f" ({ja_label})" if ja_label else "")
             
             # Display summary
             print("\nDiscovered categories summary:")
             print("-" * 60)
-            for i, (qid, name) in enumerate(list(discovered.items())[:20]):
-                ja_name = self.config.category_names_ja.get(name, "")
+            for qid, name in islice(discovered.items(), 20):
+                ja_name = known_ja.get(name, "")
                 display = f"  {qid}: {name}"
                 if ja_name:
                     display += f" ({ja_name})"
@@ -366,108 +769,112 @@ class MedicalTermsExtractor:
         
         filepath = output_dir / filename
         
-        rows = [
-            {
-                'qid': qid,
-                'category_en': en_name,
-                'category_ja': self.config.category_names_ja.get(en_name, "")
-            }
-            for qid, en_name in discovered.items()
-        ]
-        
-        df = pd.DataFrame(rows)
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        # A few hundred rows at most: the csv module is enough (no pandas)
+        with open(filepath, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['qid', 'category_en', 'category_ja'])
+            writer.writerows((qid, en_name, self.config.category_names_ja.get(en_name, ""))
+                             for qid, en_name in discovered.items())
         
         print(f"\nDiscovered categories saved to: {filepath}")
         self.logger.info(f"Saved discovered categories to: {filepath}")
     
     def _calculate_retry_wait(self, retry_count: int, error_type: str) -> int:
         """Calculate wait time for retry with exponential backoff"""
-        if error_type == '504':
-            # Exponential backoff for 504 errors
-            wait = min(self.config.retry_wait_max, 
-                      (3 ** retry_count) * self.config.retry_wait_504_base)
-        elif error_type == 'network':
-            # Exponential backoff for network errors
-            wait = min(self.config.retry_wait_max, 
-                      (2 ** retry_count) * self.config.retry_wait_network_base)
-        else:
-            # Linear backoff for other errors
-            wait = (retry_count + 1) * self.config.retry_wait_base
-        
-        return int(wait)
+        cfg = self.config
+        return _calc_retry_wait(retry_count, error_type, cfg.retry_wait_base, cfg.retry_wait_504_base,
+                                cfg.retry_wait_network_base, cfg.retry_wait_max)
+    
+    def _server_retry_wait(self, error: Exception) -> Optional[float]:
+        """Retry delay signaled by the server on a 429/503/504 response, if any"""
+        response = getattr(error, 'response', None)
+        if response is None or response.status_code not in (429, 503, 504):
+            return None
+        wait = parse_retry_after(response.headers.get('Retry-After'))
+        return min(wait, self.config.retry_wait_max) if wait is not None else None
     
     def execute_sparql_with_retry(self, query: str, category_name: str, 
-                                  offset: int, batch_size: int, 
-                                  retry_count: int = 0) -> Dict[str, Any]:
-        """Execute SPARQL query with retry mechanism"""
-        self.stats.total_queries += 1
-        
-        self.logger.info("")
-        self.logger.info("-" * 60)
-        self.logger.info("SPARQL Query Execution")
-        self.logger.info("-" * 60)
-        self.logger.info(f"Category: {category_name}")
-        self.logger.info(f"Offset: {offset}")
-        self.logger.info(f"Batch Size: {batch_size}")
-        self.logger.info(f"Query Number: {self.stats.total_queries}")
-        self.logger.debug(f"Query:\n{query}")
-        self.logger.info("-" * 60)
-        
-        start_time = time.time()
+                                  offset: int, batch_size: int) -> Dict[str, Any]:
+        """Execute SPARQL query, retrying failed attempts with backoff"""
+        self.stats.add(total_queries=1)
+        log_info = self.logger.isEnabledFor(logging.INFO)
         
-        try:
-            self.sparql.setQuery(query)
-            self.logger.info(f"Sending HTTP Request to: {self.config.api_endpoint}")
-            
-            results = self.sparql.query().convert()
-            elapsed_time = time.time() - start_time
-            bindings = results["results"]["bindings"]
-            
+        if log_info:
             self.logger.info("")
-            self.logger.info("Response:")
-            self.logger.info(f"  Results: {len(bindings)} items")
-            self.logger.info(f"  Elapsed Time: {elapsed_time:.2f} seconds")
-            
-            if bindings:
-                self.logger.info("  Sample (first 3 items):")
-                for i, binding in enumerate(bindings[:3]):
-                    item_id = binding.get('item', {}).get('value', '').split('/')[-1]
-                    en_label = binding.get('enLabel', {}).get('value', '')
-                    ja_label = binding.get('jaLabel', {}).get('value', '')
-                    self.logger.info(f"    [{i+1}] {item_id} | EN: {en_label} | JA: {ja_label}")
-            
             self.logger.info("-" * 60)
+            self.logger.info("SPARQL Query Execution")
+            self.logger.info("-" * 60)
+            self.logger.info("Category: %s", category_name)
+            self.logger.info("Offset: %s", offset)
+            self.logger.info("Batch Size: %s", batch_size)
+            self.logger.info("Query Number: %s", self.stats.total_queries)
+            self.logger.debug("Query:\n%s", query)
+            self.logger.info("-" * 60)
+        
+        for retry_count in range(self.config.max_retries + 1):
+            start_time = time.time()
             
-            self.stats.successful_queries += 1
-            self.stats.total_items += len(bindings)
+            try:
+                self.logger.info("Sending HTTP Request to: %s", self.config.api_endpoint)
+                results = self._run_query(query)
             
-            return results
+            except Exception as e:
+                if isinstance(e, requests.HTTPError):
+                    retry, wait_time = self._handle_http_error(e, category_name, offset, retry_count)
+                elif isinstance(e, (requests.ConnectionError, requests.Timeout)):
+                    retry, wait_time = self._handle_network_error(e, category_name, offset, retry_count)
+                else:
+                    retry, wait_time = self._handle_general_error(e, category_name, offset, retry_count)
+                
+                if not retry:
+                    self.stats.add(failed_queries=1)
+                    raise
             
-        except HTTPError as e:
-            return self._handle_http_error(e, query, category_name, offset, 
-                                          batch_size, retry_count)
-        
-        except (IncompleteRead, URLError, socket.timeout) as e:
-            return self._handle_network_error(e, query, category_name, offset, 
-                                             batch_size, retry_count)
+            else:
+                bindings = results["results"]["bindings"]
+                
+                if log_info:
+                    self.logger.info("")
+                    self.logger.info("Response:")
+                    self.logger.info("  Results: %d items", len(bindings))
+                    self.logger.info("  Elapsed Time: %.2f seconds", time.time() - start_time)
+                    
+                    if bindings:
+                        self.logger.info("  Sample (first 3 items):")
+                        for i, binding in enumerate(bindings[:3]):
+                            item_id = binding.get('item', {}).get('value', '').rpartition('/')[2]
+                            en_label = binding.get('enLabel', {}).get('value', '')
+                            ja_label = binding.get('jaLabel', {}).get('value', '')
+                            self.logger.info("    [%d] %s | EN: %s | JA: %s", i + 1, item_id, en_label, ja_label)
+                    
+                    self.logger.info("-" * 60)
+                
+                self.stats.add(successful_queries=1, total_items=len(bindings))
+                
+                return results
+            
+            self.stats.add(total_retries=1)
+            time.sleep(wait_time)
         
-        except Exception as e:
-            return self._handle_general_error(e, query, category_name, offset, 
-                                             batch_size, retry_count)
+        raise RuntimeError("Retry loop exited without a result")
     
-    def _handle_http_error(self, error: HTTPError, query: str, category_name: str,
-                          offset: int, batch_size: int, retry_count: int) -> Dict[str, Any]:
-        """Handle HTTP errors with specific logic for 504"""
-        self.stats.failed_queries += 1
+    def _handle_http_error(self, error: requests.HTTPError, category_name: str,
+                           offset: int, retry_count: int) -> Tuple[bool, float]:
+        """
+        Classify an HTTP error, with specific logic for 504
+        
+        Returns:
+            (retry, wait_time): whether to try again, and after how many seconds
+        """
         self._log_error(error, retry_count + 1, category_name, offset)
         
-        if error.code == 504:
-            self.stats.timeout_504_errors += 1
+        if error.response is not None and error.response.status_code == 504:
+            self.stats.add(timeout_504_errors=1)
             
             if retry_count < self.config.max_retries:
-                self.stats.total_retries += 1
-                wait_time = self._calculate_retry_wait(retry_count, '504')
+                wait_time = self._server_retry_wait(error)
+                if wait_time is None:
+                    wait_time = self._calculate_retry_wait(retry_count, '504')
                 
                 print(f"504 Gateway Timeout (attempt {retry_count + 1}/{self.config.max_retries})")
                 print("Query too complex or server overloaded.")
@@ -476,61 +883,51 @@ class MedicalTermsExtractor:
                 
                 self.logger.warning(f"504 Gateway Timeout - Retrying after {wait_time} seconds...")
                 self.logger.warning("Suggestion: Reduce batch size or query complexity")
-                
-                time.sleep(wait_time)
-                return self.execute_sparql_with_retry(query, category_name, offset, 
-                                                     batch_size, retry_count + 1)
-            else:
-                self._log_504_exhausted()
-                raise
-        else:
-            self.stats.other_errors += 1
-            return self._retry_or_raise(error, query, category_name, offset, 
-                                       batch_size, retry_count, 'http')
-    
-    def _handle_network_error(self, error: Exception, query: str, category_name: str,
-                             offset: int, batch_size: int, retry_count: int) -> Dict[str, Any]:
-        """Handle network errors"""
-        self.stats.failed_queries += 1
-        self.stats.network_errors += 1
+                return True, wait_time
+            
+            self._log_504_exhausted()
+            return False, 0
+        
+        self.stats.add(other_errors=1)
+        return self._retry_decision(error, retry_count, 'http')
+    
+    def _handle_network_error(self, error: Exception, category_name: str,
+                              offset: int, retry_count: int) -> Tuple[bool, float]:
+        """Classify a network error; returns (retry, wait_time)"""
+        self.stats.add(network_errors=1)
         self._log_error(error, retry_count + 1, category_name, offset)
         
-        return self._retry_or_raise(error, query, category_name, offset, 
-                                   batch_size, retry_count, 'network')
+        return self._retry_decision(error, retry_count, 'network')
     
-    def _handle_general_error(self, error: Exception, query: str, category_name: str,
-                             offset: int, batch_size: int, retry_count: int) -> Dict[str, Any]:
-        """Handle general errors"""
-        self.stats.failed_queries += 1
-        self.stats.other_errors += 1
+    def _handle_general_error(self, error: Exception, category_name: str,
+                              offset: int, retry_count: int) -> Tuple[bool, float]:
+        """Classify any other error; returns (retry, wait_time)"""
+        self.stats.add(other_errors=1)
         self._log_error(error, retry_count + 1, category_name, offset)
         
-        return self._retry_or_raise(error, query, category_name, offset, 
-                                   batch_size, retry_count, 'general')
+        return self._retry_decision(error, retry_count, 'general')
     
-    def _retry_or_raise(self, error: Exception, query: str, category_name: str,
-                       offset: int, batch_size: int, retry_count: int, 
-                       error_type: str) -> Dict[str, Any]:
-        """Generic retry logic"""
+    def _retry_decision(self, error: Exception, retry_count: int,
+                        error_type: str) -> Tuple[bool, float]:
+        """Generic retry logic; returns (retry, wait_time)"""
         if retry_count < self.config.max_retries:
-            self.stats.total_retries += 1
-            wait_time = self._calculate_retry_wait(retry_count, error_type)
+            wait_time = self._server_retry_wait(error)
+            if wait_time is None:
+                wait_time = self._calculate_retry_wait(retry_count, error_type)
             
             error_name = type(error).__name__
-            if hasattr(error, 'code'):
-                error_name = f"HTTP Error {error.code}"
+            if isinstance(error, requests.HTTPError) and error.response is not None:
+                error_name = f"HTTP Error {error.response.status_code}"
             
             print(f"{error_name} (attempt {retry_count + 1}/{self.config.max_retries})")
             print(f"Waiting {wait_time} seconds before retry...")
             
             self.logger.warning(f"Retrying after {wait_time} seconds...")
-            
-            time.sleep(wait_time)
-            return self.execute_sparql_with_retry(query, category_name, offset, 
-                                                 batch_size, retry_count + 1)
-        else:
-            self.logger.error("Max retries reached. Giving up on this batch.")
-            raise
+            return True, wait_time
+        
+        self.logger.error("Max retries reached. Giving up on this batch.")
+        return False, 0
+    
     
     def _log_error(self, error: Exception, retry_count: int, 
                    category_name: str, offset: int) -> None:
@@ -569,10 +966,39 @@ class MedicalTermsExtractor:
     
     def fetch_batch(self, category_qid: str, category_name: str, 
                    offset: int, batch_size: int) -> List[Dict[str, Any]]:
-        """Fetch one batch of data"""
+        """Fetch one batch of data (from the batch cache when possible)"""
+        if self.cache is not None:
+            bindings = self.cache.get(category_qid, offset, batch_size)
+            if bindings is not None:
+                self.logger.info(f"Cache hit: {category_name} offset={offset} ({len(bindings)} items)")
+                return bindings
+        
         query = SPARQLQueryBuilder.build_batch_query(category_qid, batch_size, offset)
         results = self.execute_sparql_with_retry(query, category_name, offset, batch_size)
-        return results["results"]["bindings"]
+        bindings = results["results"]["bindings"]
+        
+        if self.cache is not None:
+            self.cache.set(category_qid, offset, batch_size, bindings)
+        return bindings
+
+    async def _fetch_batches_concurrently(self, category_qid: str, category_name: str,
+                                          pages: List[Tuple[int, int]]) -> List[Any]:
+        """
+        Fetch several (offset, batch_size) pages with at most
+        `sparql_concurrency` queries in flight
+        
+        Returns:
+            One entry per page, in page order: the bindings, or the exception raised
+        """
+        semaphore = asyncio.Semaphore(max(1, self.config.sparql_concurrency))
+        
+        async def fetch(offset: int, batch_size: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(self.fetch_batch, category_qid, category_name,
+                                               offset, batch_size)
+        
+        return await asyncio.gather(*(fetch(offset, size) for offset, size in pages),
+                                    return_exceptions=True)
 
     def get_label_counts(self, category_qid: str) -> Tuple[int, int, int]:
         """Return (total, en, ja) counts for items in the category graph"""
@@ -586,12 +1012,63 @@ class MedicalTermsExtractor:
         ja = int(b[0]["jaCount"]["value"])
         return (total, en, ja)
     
+    def get_label_counts_batch(self, category_qids: List[str]) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Return (total, en, ja) counts for several categories, querying
+        LABEL_COUNT_GROUP_SIZE categories per request
+        
+        The combined query of a group is tried once, without retries; if it
+        fails the group is counted one category at a time, and categories
+        whose count still fails are left out.
+        """
+        counts: Dict[str, Tuple[int, int, int]] = {}
+        for start in range(0, len(category_qids), LABEL_COUNT_GROUP_SIZE):
+            group = category_qids[start:start + LABEL_COUNT_GROUP_SIZE]
+            self.stats.add(total_queries=1)
+            try:
+                results = self._run_query(SPARQLQueryBuilder.build_label_count_batch_query(group))
+            except Exception as e:
+                self.stats.add(failed_queries=1)
+                self.logger.error(f"Batched label count failed, counting per category: {e}")
+                for qid in group:
+                    try:
+                        counts[qid] = self.get_label_counts(qid)
+                    except Exception:
+                        pass
+                continue
+            self.stats.add(successful_queries=1)
+            
+            # Categories without any items produce no row
+            counts.update((qid, (0, 0, 0)) for qid in group)
+            for b in results["results"]["bindings"]:
+                counts[b["cat"]["value"].rpartition('/')[2]] = (
+                    int(b["total"]["value"]),
+                    int(b["enCount"]["value"]),
+                    int(b["jaCount"]["value"]),
+                )
+        return counts
+    
     def fetch_terms_by_category(self, category_qid: str, category_name_en: str, 
                                limit: Optional[int] = None,
                                target_lang: Optional[str] = None,
-                               target_min: Optional[int] = None) -> List[Dict[str, str]]:
-        """Fetch medical terms from specified category with pagination"""
-        category_name_ja = self.config.category_names_ja.get(category_name_en, category_name_en)
+                               target_min: Optional[int] = None,
+                               writer: Optional[pq.ParquetWriter] = None,
+                               seen: Optional[set[str]] = None) -> pd.DataFrame:
+        """
+        Fetch medical terms from specified category with pagination
+        
+        With a Parquet `writer`, each batch is appended to it as soon as it is
+        extracted and the returned DataFrame is empty.
+        
+        QIDs in `seen` (default: every QID collected so far) are skipped and
+        new ones are added to it.
+        """
+        import pandas as pd
+        import pyarrow as pa
+        
+        # The same two string objects back every row of the category
+        category_name_en = sys.intern(category_name_en)
+        category_name_ja = sys.intern(self.config.category_names_ja.get(category_name_en, category_name_en))
         
         self.logger.info("")
         self.logger.info("=" * 60)
@@ -603,7 +1080,14 @@ class MedicalTermsExtractor:
         print(f"Category: {category_name_en} ({category_name_ja})")
         print("=" * 60)
         
-        all_terms = []
+        if seen is None:
+            seen = self._seen_qids
+        
+        # Values are collected column-wise and turned into one DataFrame at the end
+        qids: List[str] = []
+        columns: Dict[str, List[str]] = {col: [] for _, col in TERM_BINDINGS}
+        target_col = {'ja': 'ja_label', 'en': 'en_label'}.get(target_lang)
+        collected = 0
         offset = 0
         consecutive_empty = 0
         
@@ -614,14 +1098,31 @@ class MedicalTermsExtractor:
 
         self.logger.info(f"Batch Size: {self.config.batch_size}")
         
-        while offset < effective_limit:
-            try:
-                remaining = effective_limit - offset
-                current_batch_size = min(self.config.batch_size, remaining)
-                
-                print(f"  Fetching... offset={offset} (current: {len(all_terms)} items)", end='\r')
-                
-                bindings = self.fetch_batch(category_qid, category_name_en, offset, current_batch_size)
+        window = max(1, self.config.sparql_concurrency)
+        done = False
+        
+        while offset < effective_limit and not done:
+            # The next `window` offset pages are fetched concurrently, then
+            # processed in order exactly as a sequential loop would
+            pages = []
+            next_offset = offset
+            while len(pages) < window and next_offset < effective_limit:
+                current_batch_size = min(self.config.batch_size, effective_limit - next_offset)
+                pages.append((next_offset, current_batch_size))
+                next_offset += current_batch_size
+            
+            print(f"  Fetching... offset={offset} (current: {collected} items)", end='\r')
+            
+            results = asyncio.run(self._fetch_batches_concurrently(category_qid, category_name_en, pages))
+            
+            for (offset, current_batch_size), bindings in zip(pages, results):
+                if isinstance(bindings, Exception):
+                    print(f"\n  Batch fetch failed (offset={offset}): {bindings}")
+                    self.logger.error(f"Batch fetch failed at offset {offset}. Skipping category.")
+                    self.logger.error("".join(traceback.format_exception(bindings)))
+                    print("  Skipping this category and continuing...")
+                    done = True
+                    break
                 
                 if not bindings:
                     consecutive_empty += 1
@@ -630,72 +1131,97 @@ class MedicalTermsExtractor:
                     if consecutive_empty >= self.config.max_empty_batches:
                         print("\n  No more results. Category completed.")
                         self.logger.info("Category completed (consecutive empty batches)")
+                        done = True
                         break
                     
-                    offset += current_batch_size
                     continue
                 
                 consecutive_empty = 0
                 
-                for result in bindings:
-                    term = {
-                        'qid': result['item']['value'].split('/')[-1],
-                        'category_en': category_name_en,
-                        'category_ja': category_name_ja,
-                        'category_qid': category_qid,
-                        'en_label': result.get('enLabel', {}).get('value', ''),
-                        'ja_label': result.get('jaLabel', {}).get('value', ''),
-                        'en_description': result.get('enDescription', {}).get('value', ''),
-                        'ja_description': result.get('jaDescription', {}).get('value', ''),
-                        'mesh_id': result.get('meshId', {}).get('value', ''),
-                        'icd10': result.get('icd10', {}).get('value', ''),
-                        'icd11': result.get('icd11', {}).get('value', ''),
-                        'icd9': result.get('icd9', {}).get('value', ''),
-                        'snomed_id': result.get('snomedId', {}).get('value', ''),
-                        'umls_id': result.get('umlsId', {}).get('value', ''),
-                    }
-                    all_terms.append(term)
-
-                    if target_lang == 'ja' and term['ja_label']:
-                        count_target += 1
-                    elif target_lang == 'en' and term['en_label']:
-                        count_target += 1
+                fresh = []
+                with self._terms_lock:
+                    for result in bindings:
+                        qid = result['item']['value'].rpartition('/')[2]
+                        if qid in seen:
+                            continue
+                        seen.add(qid)
+                        qids.append(qid)
+                        fresh.append(result)
+                    self.stats.add(duplicate_items=len(bindings) - len(fresh))
+                
+                if fresh:
+                    for var, col in TERM_BINDINGS:
+                        columns[col].extend(result[var]['value'] if var in result else ''
+                                            for result in fresh)
+                    
+                    if target_col:
+                        count_target += sum(map(bool, columns[target_col][-len(fresh):]))
+                    
+                    collected += len(fresh)
+                    if writer is not None:
+                        batch = pa.RecordBatch.from_pydict(
+                            self._term_columns(qids, columns, category_qid,
+                                               category_name_en, category_name_ja),
+                            schema=term_schema())
+                        with self._terms_lock:
+                            writer.write_batch(batch)
+                        qids.clear()
+                        for values in columns.values():
+                            values.clear()
 
                 if target_lang and target_min and count_target >= target_min:
                     print("\n  Target language threshold reached.")
                     self.logger.info(f"Target language '{target_lang}' count reached: {count_target}")
+                    done = True
                     break
                 
                 if len(bindings) < current_batch_size:
                     print("\n  Last batch received.")
                     self.logger.info("Last batch received (partial batch)")
+                    done = True
                     break
-                
-                offset += current_batch_size
-                time.sleep(self.config.wait_between_batches)
-                
-            except Exception as e:
-                print(f"\n  Batch fetch failed (offset={offset}): {e}")
-                self.logger.error(f"Batch fetch failed at offset {offset}. Skipping category.")
-                self.logger.error(traceback.format_exc())
-                print("  Skipping this category and continuing...")
-                break
+            
+            offset = next_offset
         
-        print(f"\n  Completed: {len(all_terms)} items")
+        print(f"\n  Completed: {collected} items")
         
         self.logger.info("")
         self.logger.info(f"Category Completed: {category_name_en}")
-        self.logger.info(f"Total items collected: {len(all_terms)}")
+        self.logger.info(f"Total items collected: {collected}")
         self.logger.info("=" * 60)
         
-        return all_terms
+        return pd.DataFrame(self._term_columns(qids, columns, category_qid,
+                                               category_name_en, category_name_ja),
+                            columns=TERM_COLUMNS)
+    
+    @staticmethod
+    def _term_columns(qids: List[str], columns: Dict[str, List[str]], category_qid: str,
+                      category_name_en: str, category_name_ja: str) -> Dict[str, List[str]]:
+        """Full term columns for collected QIDs and their binding columns"""
+        n = len(qids)
+        return {
+            'qid': qids,
+            'category_en': [category_name_en] * n,
+            'category_ja': [category_name_ja] * n,
+            'category_qid': [category_qid] * n,
+            **columns,
+        }
     
     def extract_all(self, categories: Dict[str, str], 
                    limit_per_category: Optional[int] = None,
                    target_lang: Optional[str] = None,
-                   target_min: Optional[int] = None) -> pd.DataFrame:
-        """Extract medical terms from all categories"""
-        all_terms = []
+                   target_min: Optional[int] = None,
+                   parquet_file: Optional[Path] = None) -> pd.DataFrame:
+        """
+        Extract medical terms from all categories
+        
+        If `parquet_file` is given, terms are streamed to it batch by batch
+        and the result is read back from it once extraction is done, so the
+        fetched rows are never all held as Python objects.
+        """
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
         
         print("\n" + "=" * 60)
         print(f"Medical Terms Extraction: {len(categories)} categories")
@@ -708,11 +1234,12 @@ class MedicalTermsExtractor:
 
         # Show label counts per category first
         print("\nLabel coverage per category (pre-check):")
+        label_counts = self.get_label_counts_batch(list(categories))
         for qid, name_en in categories.items():
-            try:
-                total, en, ja = self.get_label_counts(qid)
+            if qid in label_counts:
+                total, en, ja = label_counts[qid]
                 print(f"  - {name_en} ({qid}): total={total}, en={en}, ja={ja}")
-            except Exception as _:
+            else:
                 print(f"  - {name_en} ({qid}): count failed")
         print("=" * 60)
         
@@ -725,117 +1252,170 @@ class MedicalTermsExtractor:
         
         start_time = time.time()
         
-        for idx, (qid, name_en) in enumerate(categories.items(), 1):
+        writer = None
+        if parquet_file is not None:
+            Path(parquet_file).parent.mkdir(parents=True, exist_ok=True)
+            writer = pq.ParquetWriter(parquet_file, term_schema(), compression='zstd')
+        
+        # One category at a time, batches go straight to the shared seen set
+        # and the Parquet writer. Categories fetched in parallel only drop
+        # duplicates within themselves; their frames are then deduplicated
+        # against earlier categories and written in config order below, so a
+        # QID always belongs to its first category, as in a sequential run
+        parallel = self.config.max_parallel_categories > 1 and len(categories) > 1
+        if parallel and target_lang and target_min:
+            # The target-language stop counts only QIDs no earlier category
+            # owns, which a category fetched in parallel cannot know yet
+            self._tee("Note: --target-lang fetches categories one at a time "
+                      "(query.max_parallel_categories is ignored)")
+            parallel = False
+        
+        def fetch_category(idx: int, qid: str, name_en: str) -> pd.DataFrame:
             name_ja = self.config.category_names_ja.get(name_en, name_en)
             print(f"\n[{idx}/{len(categories)}] {name_en} ({name_ja})")
             
-            terms = self.fetch_terms_by_category(qid, name_en, limit_per_category, target_lang=target_lang, target_min=target_min)
-            all_terms.extend(terms)
+            terms = self.fetch_terms_by_category(qid, name_en, limit_per_category, target_lang=target_lang,
+                                                 target_min=target_min,
+                                                 writer=None if parallel else writer,
+                                                 seen=set() if parallel else None)
             
+            # Per-worker pause before it starts its next category
             if idx < len(categories):
                 time.sleep(self.config.wait_between_categories)
+            return terms
+        
+        frames = []
+        try:
+            workers = self.config.max_parallel_categories if parallel else 1
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(fetch_category, idx, qid, name_en)
+                           for idx, (qid, name_en) in enumerate(categories.items(), 1)]
+                # Results are taken in submission (category) order
+                for future in futures:
+                    terms = future.result()
+                    if not parallel:
+                        frames.append(terms)
+                        continue
+                    terms = self._drop_seen_qids(terms)
+                    if writer is not None:
+                        writer.write_table(pa.Table.from_pandas(terms, schema=term_schema(),
+                                                                preserve_index=False))
+                    else:
+                        frames.append(terms)
+        finally:
+            if writer is not None:
+                writer.close()
         
         elapsed_time = time.time() - start_time
+        if parquet_file is not None:
+            df = pq.read_table(parquet_file).to_pandas()
+            self.logger.info(f"Parquet: {parquet_file} ({len(df)} rows)")
+        else:
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
         
         print("\n" + "=" * 60)
         print("Extraction completed")
-        print(f"Total items: {len(all_terms)}")
+        print(f"Total items: {len(df)}")
         print(f"Elapsed time: {elapsed_time/60:.1f} minutes")
         print("=" * 60 + "\n")
         
-        self._log_extraction_summary(len(all_terms), elapsed_time)
-        
-        df = pd.DataFrame(all_terms)
+        self._log_extraction_summary(len(df), elapsed_time)
         
         if len(df) == 0:
             print("Warning: No data collected.")
             self.logger.warning("No data collected!")
             return df
         
-        # Remove duplicates
-        original_count = len(df)
-        df = df.drop_duplicates(subset=['qid'])
-        duplicates_removed = original_count - len(df)
+        # Category columns as codes, every other column as Arrow strings
+        # (whatever pandas' default string dtype is), so the '' sweeps of
+        # the analysis and the CSV writer work on Arrow buffers
+        df = df.astype({col: 'category' if col in CATEGORY_COLUMNS else 'string[pyarrow]'
+                        for col in df.columns})
+        
+        # Duplicates were already skipped while fetching
+        duplicates_removed = self.stats.duplicate_items
         
         if duplicates_removed > 0:
-            print(f"Duplicates removed: {duplicates_removed}")
-            print(f"Unique items: {len(df)}\n")
-            
-            self.logger.info("")
-            self.logger.info(f"Duplicates removed: {duplicates_removed}")
-            self.logger.info(f"Unique items: {len(df)}")
+            self._tee(f"Duplicates removed: {duplicates_removed}")
+            self._tee(f"Unique items: {len(df)}")
+            print()
         
         return df
     
+    def _drop_seen_qids(self, terms: pd.DataFrame) -> pd.DataFrame:
+        """Drop terms whose QID an earlier category already has, then claim the rest"""
+        with self._terms_lock:
+            fresh = ~terms['qid'].isin(self._seen_qids).to_numpy(dtype=bool)
+            self._seen_qids.update(terms['qid'][fresh])
+            self.stats.add(duplicate_items=len(terms) - int(fresh.sum()))
+        return terms[fresh].reset_index(drop=True)
+    
     def _log_extraction_summary(self, total_items: int, elapsed_time: float) -> None:
-        """Log extraction summary"""
-        self.logger.info("")
-        self.logger.info("#" * 60)
-        self.logger.info("EXTRACTION COMPLETED")
-        self.logger.info("#" * 60)
-        self.logger.info(f"Total Items Collected: {total_items}")
-        self.logger.info(f"Elapsed Time: {elapsed_time/60:.1f} minutes")
-        self.logger.info("")
-        self.logger.info("Statistics:")
-        self.logger.info(f"  Total Queries: {self.stats.total_queries}")
-        self.logger.info(f"  Successful Queries: {self.stats.successful_queries}")
-        self.logger.info(f"  Failed Queries: {self.stats.failed_queries}")
-        self.logger.info(f"  Total Retries: {self.stats.total_retries}")
-        self.logger.info(f"  Total Items Retrieved: {self.stats.total_items}")
-        self.logger.info("")
-        self.logger.info("Error Breakdown:")
-        self.logger.info(f"  504 Gateway Timeout: {self.stats.timeout_504_errors}")
-        self.logger.info(f"  Network Errors: {self.stats.network_errors}")
-        self.logger.info(f"  Other Errors: {self.stats.other_errors}")
+        """Log extraction summary (one multi-line record)"""
+        lines = [
+            "",
+            "#" * 60,
+            "EXTRACTION COMPLETED",
+            "#" * 60,
+            f"Total Items Collected: {total_items}",
+            f"Elapsed Time: {elapsed_time/60:.1f} minutes",
+            "",
+            "Statistics:",
+            f"  Total Queries: {self.stats.total_queries}",
+            f"  Successful Queries: {self.stats.successful_queries}",
+            f"  Failed Queries: {self.stats.failed_queries}",
+            f"  Total Retries: {self.stats.total_retries}",
+            f"  Total Items Retrieved: {self.stats.total_items}",
+            "",
+            "Error Breakdown:",
+            f"  504 Gateway Timeout: {self.stats.timeout_504_errors}",
+            f"  Network Errors: {self.stats.network_errors}",
+            f"  Other Errors: {self.stats.other_errors}",
+        ]
         
         success_rate = self.stats.success_rate()
         if success_rate > 0:
-            self.logger.info("")
-            self.logger.info(f"  Success Rate: {success_rate}%")
-        self.logger.info("#" * 60)
+            lines += ["", f"  Success Rate: {success_rate}%"]
+        lines.append("#" * 60)
+        self.logger.info("\n".join(lines))
     
     def analyze_data_quality(self, df: pd.DataFrame) -> pd.DataFrame:
         """Analyze data quality"""
         if len(df) == 0:
             print("No data available. Skipping analysis.")
-            return pd.DataFrame()
+            return df.iloc[0:0]
         
         print("\n" + "=" * 60)
         print("Data Quality Analysis")
         print("=" * 60 + "\n")
         
-        self.logger.info("")
-        self.logger.info("=" * 60)
-        self.logger.info("DATA QUALITY ANALYSIS")
-        self.logger.info("=" * 60)
+        self.logger.info("\n".join(["", "=" * 60, "DATA QUALITY ANALYSIS", "=" * 60]))
         
         # Basic statistics
         print("1. Basic Statistics:")
-        print(f"   Total records: {len(df)}")
-        self.logger.info(f"Total Records: {len(df)}")
-        
-        print(f"   Unique QIDs: {df['qid'].nunique()}")
-        self.logger.info(f"Unique QIDs: {df['qid'].nunique()}")
+        self._tee(f"   Total records: {len(df)}")
+        self._tee(f"   Unique QIDs: {df['qid'].nunique()}")
         
         # Language coverage
         print("\n2. Language Coverage:")
-        has_en = (df['en_label'].notna() & (df['en_label'] != '')).sum()
-        has_ja = (df['ja_label'].notna() & (df['ja_label'] != '')).sum()
-
-        en_pct = has_en / len(df) * 100
-        ja_pct = has_ja / len(df) * 100
+        n = len(df)
+        counts = coverage_counts(df)
+        pcts = counts * (100.0 / n)
+        has_en, has_ja = counts['en_label'], counts['ja_label']
+        en_pct, ja_pct = pcts['en_label'], pcts['ja_label']
 
-        print(f"   English labels: {has_en} ({en_pct:.1f}%)")
-        print(f"   Japanese labels: {has_ja} ({ja_pct:.1f}%)")
+        self._tee(f"   English labels: {has_en} ({en_pct:.1f}%)")
+        self._tee(f"   Japanese labels: {has_ja} ({ja_pct:.1f}%)")
 
-        self.logger.info(f"English Labels: {has_en} ({en_pct:.1f}%)")
-        self.logger.info(f"Japanese Labels: {has_ja} ({ja_pct:.1f}%)")
-
-        # Detailed breakdown
-        en_only = len(df[(df['en_label'] != '') & (df['ja_label'] == '')])
-        ja_only = len(df[(df['en_label'] == '') & (df['ja_label'] != '')])
-        both = len(df[(df['en_label'] != '') & (df['ja_label'] != '')])
-        neither = len(df[(df['en_label'] == '') & (df['ja_label'] == '')])
+        # Detailed breakdown: one mask per label column, combined as numpy
+        # bool arrays
+        en_mask = (df['en_label'] != '').to_numpy(dtype=bool)
+        ja_mask = (df['ja_label'] != '').to_numpy(dtype=bool)
+        bilingual_mask = en_mask & ja_mask
+        both = int(bilingual_mask.sum())
+        en_only = int(en_mask.sum()) - both
+        ja_only = int(ja_mask.sum()) - both
+        neither = n - both - en_only - ja_only
 
         print("\n3. Label Pattern Breakdown:")
         print(f"   English only: {en_only} ({en_only/len(df)*100:.1f}%)")
@@ -852,50 +1432,44 @@ class MedicalTermsExtractor:
         
         # Description coverage
         print("\n4. Description Coverage:")
-        has_en_desc = (df['en_description'].notna() & (df['en_description'] != '')).sum()
-        has_ja_desc = (df['ja_description'].notna() & (df['ja_description'] != '')).sum()
-
-        print(f"   English descriptions: {has_en_desc} ({has_en_desc/len(df)*100:.1f}%)")
-        print(f"   Japanese descriptions: {has_ja_desc} ({has_ja_desc/len(df)*100:.1f}%)")
+        print(f"   English descriptions: {counts['en_description']} ({pcts['en_description']:.1f}%)")
+        print(f"   Japanese descriptions: {counts['ja_description']} ({pcts['ja_description']:.1f}%)")
 
         # External ID coverage
         print("\n5. External ID Coverage:")
-        external_ids = [
-            ('mesh_id', 'MeSH'),
-            ('icd10', 'ICD-10'),
-            ('icd11', 'ICD-11'),
-            ('icd9', 'ICD-9'),
-            ('snomed_id', 'SNOMED CT'),
-            ('umls_id', 'UMLS')
-        ]
-
-        for col, name in external_ids:
-            count = (df[col].notna() & (df[col] != '')).sum()
-            pct = count / len(df) * 100
-            print(f"   {name}: {count} ({pct:.1f}%)")
-            self.logger.info(f"{name}: {count} ({pct:.1f}%)")
+        for col, name in EXTERNAL_ID_NAMES:
+            count, pct = counts[col], pcts[col]
+            self._tee(f"   {name}: {count} ({pct:.1f}%)")
 
         # Category breakdown
-        print("\n6. Items by Category:")
-        self.logger.info("")
-        self.logger.info("Category Breakdown:")
-        category_counts = df['category_en'].value_counts().sort_values(ascending=False)
+        self._tee()
+        self._tee("6. Items by Category:")
+        category_counts = df['category_en'].value_counts()  # sorted, most frequent first
         
         for category, count in category_counts.items():
             cat_ja = self.config.category_names_ja.get(category, category)
-            print(f"   {category} ({cat_ja}): {count}")
-            self.logger.info(f"  {category}: {count}")
+            self._tee(f"   {category} ({cat_ja}): {count}")
         
         # Bilingual pairs (already shown in section 3)
-        bilingual = df[(df['en_label'] != '') & (df['ja_label'] != '')]
+        bilingual = df[bilingual_mask]
+        self._quality = {'frame': df, 'bilingual': bilingual,
+                         'coverage': counts, 'category_counts': category_counts}
 
         print("\n" + "=" * 60 + "\n")
         self.logger.info("=" * 60)
         
         return bilingual
     
-    def save_results(self, df: pd.DataFrame, prefix: str = "small") -> Dict[str, Optional[Path]]:
-        """Save results as CSV and JSON with proper path handling"""
+    def save_results(self, df: pd.DataFrame, prefix: str = "small",
+                     parquet_file: Optional[Path] = None) -> Dict[str, Optional[Path]]:
+        """
+        Save results as CSV and JSON with proper path handling
+        
+        The output files are independent, so they are written concurrently
+        on a thread pool and reported in a fixed order once all are done.
+        `parquet_file` is the Parquet file already streamed by extract_all;
+        it is only reported here.
+        """
         if len(df) == 0:
             print("No data to save. Skipping.")
             self.logger.warning("No data to save")
@@ -905,66 +1479,81 @@ class MedicalTermsExtractor:
         output_dir = Path(self.config.output_directory)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        print("Saving results...\n")
-        self.logger.info("")
-        self.logger.info("Saving results...")
+        self._tee("Saving results...")
+        print()
         
-        saved_files = {}
+        if self._quality is not None and self._quality['frame'] is df:
+            bilingual_df = self._quality['bilingual']
+        else:
+            bilingual_df = df[(df['en_label'] != '').to_numpy(dtype=bool)
+                              & (df['ja_label'] != '').to_numpy(dtype=bool)]
+        
+        # (key, path, writes); reported in this order
+        jobs: List[Tuple[str, Path, List[Callable[[], None]]]] = []
         
         # Full CSV
         if self.config.save_full_csv:
             full_csv = output_dir / f"{prefix}_medical_terms_full_{timestamp}.csv"
-            df.to_csv(full_csv, index=False, encoding='utf-8-sig')
-            file_size_mb = full_csv.stat().st_size / (1024 * 1024)
-            print(f"   Full CSV: {full_csv} ({file_size_mb:.2f} MB)")
-            self.logger.info(f"Full CSV: {full_csv} ({file_size_mb:.2f} MB)")
-            saved_files['full_csv'] = full_csv
+            jobs.append(('full_csv', full_csv, [lambda: write_csv_arrow(df, full_csv)]))
         
         # EN-JA pairs CSV
-        bilingual_df = df[(df['en_label'] != '') & (df['ja_label'] != '')].copy()
         if self.config.save_bilingual_csv and len(bilingual_df) > 0:
             bilingual_csv = output_dir / f"{prefix}_en_ja_pairs_{timestamp}.csv"
             cols_to_save = ['qid', 'en_label', 'ja_label', 'category_en', 'category_ja',
                           'en_description', 'ja_description',
                           'mesh_id', 'icd10', 'icd11', 'icd9', 'snomed_id', 'umls_id']
-            bilingual_df[cols_to_save].to_csv(bilingual_csv, index=False, encoding='utf-8-sig')
-            file_size_mb = bilingual_csv.stat().st_size / (1024 * 1024)
-            print(f"   EN-JA pairs CSV: {bilingual_csv} ({len(bilingual_df)} pairs, {file_size_mb:.2f} MB)")
-            self.logger.info(f"EN-JA pairs CSV: {bilingual_csv} ({len(bilingual_df)} pairs, {file_size_mb:.2f} MB)")
-            saved_files['bilingual_csv'] = bilingual_csv
+            jobs.append(('bilingual_csv', bilingual_csv,
+                         [lambda: write_csv_arrow(bilingual_df, bilingual_csv, columns=cols_to_save)]))
         
         # Category CSVs
         if self.config.save_category_csvs:
             category_dir = output_dir / f"by_category_{timestamp}"
             category_dir.mkdir(parents=True, exist_ok=True)
             
-            for category in df['category_en'].unique():
-                cat_df = df[df['category_en'] == category]
-                safe_name = category.replace('/', '_').replace('\\', '_').replace(' ', '_')
-                cat_file = category_dir / f"{safe_name}.csv"
-                cat_df.to_csv(cat_file, index=False, encoding='utf-8-sig')
-            
-            cat_count = len(df['category_en'].unique())
-            print(f"   Category CSVs: {category_dir}/ ({cat_count} files)")
-            self.logger.info(f"Category CSVs: {category_dir}/ ({cat_count} files)")
-            saved_files['category_dir'] = category_dir
+            # category_en is categorical (see extract_all): one grouped pass
+            # over the codes instead of a string mask per category
+            writes = [
+                partial(write_csv_arrow, cat_df, category_dir / f"{category.translate(_FN_TR)}.csv")
+                for category, cat_df in df.groupby('category_en', observed=True, sort=False)
+            ]
+            jobs.append(('category_dir', category_dir, writes))
         
         # JSON
         if self.config.save_json:
             json_file = output_dir / f"{prefix}_medical_terms_{timestamp}.json"
-            df.to_json(json_file, orient='records', force_ascii=False, indent=2)
-            file_size_mb = json_file.stat().st_size / (1024 * 1024)
-            print(f"   JSON: {json_file} ({file_size_mb:.2f} MB)")
-            self.logger.info(f"JSON: {json_file} ({file_size_mb:.2f} MB)")
-            saved_files['json'] = json_file
+            jobs.append(('json', json_file, [lambda: write_json_records(df, json_file)]))
+        
+        # Parquet (written during extraction)
+        if parquet_file is not None and Path(parquet_file).exists():
+            jobs.append(('parquet', Path(parquet_file), []))
         
         # Report
         if self.config.save_report:
             report_file = output_dir / f"{prefix}_report_{timestamp}.txt"
-            self._save_report(df, bilingual_df, report_file, prefix)
-            print(f"   Report: {report_file}")
-            self.logger.info(f"Report: {report_file}")
-            saved_files['report'] = report_file
+            jobs.append(('report', report_file,
+                         [lambda: self._save_report(df, bilingual_df, report_file, prefix)]))
+        
+        n_writes = sum(len(writes) for _, _, writes in jobs)
+        with ThreadPoolExecutor(max_workers=max(1, min(n_writes, 8))) as executor:
+            futures = [[executor.submit(write) for write in writes] for _, _, writes in jobs]
+        
+        saved_files = {}
+        for (key, path, writes), job_futures in zip(jobs, futures):
+            for future in job_futures:
+                future.result()
+            
+            if key == 'category_dir':
+                message = f"Category CSVs: {path}/ ({len(writes)} files)"
+            elif key == 'report':
+                message = f"Report: {path}"
+            else:
+                label = {'full_csv': "Full CSV", 'bilingual_csv': "EN-JA pairs CSV",
+                         'json': "JSON", 'parquet': "Parquet"}[key]
+                file_size_mb = path.stat().st_size / (1024 * 1024)
+                pairs = f"{len(bilingual_df)} pairs, " if key == 'bilingual_csv' else ""
+                message = f"{label}: {path} ({pairs}{file_size_mb:.2f} MB)"
+            self._tee(f"   {message}")
+            saved_files[key] = path
         
         print("\nSave completed!\n")
         self.logger.info("")
@@ -972,58 +1561,59 @@ class MedicalTermsExtractor:
         
         return saved_files
     
+    
     def _save_report(self, df: pd.DataFrame, bilingual_df: pd.DataFrame, 
                     report_file: Path, prefix: str) -> None:
-        """Save extraction report"""
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 60 + "\n")
-            f.write("Wikidata Medical Terms Extraction Report\n")
-            f.write("=" * 60 + "\n\n")
-            f.write(f"Execution time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Scale: {prefix}\n")
-            f.write(f"Total items: {len(df)}\n")
-            f.write(f"EN-JA pairs: {len(bilingual_df)}\n")
-            
-            if len(df) > 0:
-                f.write(f"Bilingual ratio: {len(bilingual_df)/len(df)*100:.1f}%\n\n")
-            
-            f.write("Statistics:\n")
-            f.write(f"  Total queries: {self.stats.total_queries}\n")
-            f.write(f"  Successful: {self.stats.successful_queries}\n")
-            f.write(f"  Failed: {self.stats.failed_queries}\n")
-            f.write(f"  Retries: {self.stats.total_retries}\n\n")
-            
-            f.write("Error Breakdown:\n")
-            f.write(f"  504 Gateway Timeout: {self.stats.timeout_504_errors}\n")
-            f.write(f"  Network Errors: {self.stats.network_errors}\n")
-            f.write(f"  Other Errors: {self.stats.other_errors}\n\n")
-            
-            f.write("Items by category:\n")
-            for category, count in df['category_en'].value_counts().items():
-                cat_ja = self.config.category_names_ja.get(category, category)
-                f.write(f"  {category} ({cat_ja}): {count}\n")
-            
-            f.write("\nLanguage coverage:\n")
-            has_en = (df['en_label'].notna() & (df['en_label'] != '')).sum()
-            has_ja = (df['ja_label'].notna() & (df['ja_label'] != '')).sum()
-            en_pct = has_en / len(df) * 100 if len(df) > 0 else 0
-            ja_pct = has_ja / len(df) * 100 if len(df) > 0 else 0
-            f.write(f"  English labels: {has_en} ({en_pct:.1f}%)\n")
-            f.write(f"  Japanese labels: {has_ja} ({ja_pct:.1f}%)\n")
-
-            f.write("\nExternal ID coverage:\n")
-            external_ids = [
-                ('mesh_id', 'MeSH'),
-                ('icd10', 'ICD-10'),
-                ('icd11', 'ICD-11'),
-                ('icd9', 'ICD-9'),
-                ('snomed_id', 'SNOMED CT'),
-                ('umls_id', 'UMLS')
-            ]
-            for col, name in external_ids:
-                count = (df[col].notna() & (df[col] != '')).sum()
-                pct = count / len(df) * 100 if len(df) > 0 else 0
-                f.write(f"  {name}: {count} ({pct:.1f}%)\n")
+        """Save extraction report (built in memory, written in one call)"""
+        # Counts already computed by analyze_data_quality for this frame
+        quality = self._quality if self._quality is not None and self._quality['frame'] is df else {}
+        category_counts = quality.get('category_counts')
+        if category_counts is None:
+            category_counts = df['category_en'].value_counts()
+        counts = quality.get('coverage')
+        if counts is None:
+            counts = coverage_counts(df)
+        pcts = counts * (100.0 / len(df)) if len(df) > 0 else counts * 0
+        
+        parts = [
+            "=" * 60 + "\n",
+            "Wikidata Medical Terms Extraction Report\n",
+            "=" * 60 + "\n\n",
+            f"Execution time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"Scale: {prefix}\n",
+            f"Total items: {len(df)}\n",
+            f"EN-JA pairs: {len(bilingual_df)}\n",
+        ]
+        
+        if len(df) > 0:
+            parts.append(f"Bilingual ratio: {len(bilingual_df)/len(df)*100:.1f}%\n\n")
+        
+        parts += [
+            "Statistics:\n",
+            f"  Total queries: {self.stats.total_queries}\n",
+            f"  Successful: {self.stats.successful_queries}\n",
+            f"  Failed: {self.stats.failed_queries}\n",
+            f"  Retries: {self.stats.total_retries}\n\n",
+            "Error Breakdown:\n",
+            f"  504 Gateway Timeout: {self.stats.timeout_504_errors}\n",
+            f"  Network Errors: {self.stats.network_errors}\n",
+            f"  Other Errors: {self.stats.other_errors}\n\n",
+            "Items by category:\n",
+        ]
+        for category, count in category_counts.items():
+            cat_ja = self.config.category_names_ja.get(category, category)
+            parts.append(f"  {category} ({cat_ja}): {count}\n")
+        
+        parts += [
+            "\nLanguage coverage:\n",
+            f"  English labels: {counts['en_label']} ({pcts['en_label']:.1f}%)\n",
+            f"  Japanese labels: {counts['ja_label']} ({pcts['ja_label']:.1f}%)\n",
+            "\nExternal ID coverage:\n",
+        ]
+        for col, name in EXTERNAL_ID_NAMES:
+            parts.append(f"  {name}: {counts[col]} ({pcts[col]:.1f}%)\n")
+        
+        Path(report_file).write_text(''.join(parts), encoding='utf-8')
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -1071,6 +1661,11 @@ Examples:
                        help='Only show per-category label coverage counts and exit')
     parser.add_argument('--target-lang', choices=['en','ja'], help='Stop when this language label count reaches --target-count')
     parser.add_argument('--target-count', type=int, default=None, help='Threshold count to stop per category when --target-lang is set')
+    
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the on-disk batch cache')
+    parser.add_argument('--cache-ttl', type=int, default=86400,
+                       help='Cache entry lifetime in seconds (default: 86400)')
 
     return parser.parse_args()
 
@@ -1162,6 +1757,7 @@ def main() -> None:
     print(f"  Per category: {limit_label}")
     print(f"  Batch size: {config.batch_size} items")
     print(f"  Log file: {args.log if args.log else 'None'}")
+    print(f"  Cache: {'disabled' if args.no_cache else f'enabled (ttl={args.cache_ttl}s)'}")
     print("")
     
     # Estimate time
@@ -1178,7 +1774,8 @@ def main() -> None:
     print("=" * 60)
     
     # Initialize extractor
-    extractor = MedicalTermsExtractor(config=config, log_file=args.log)
+    extractor = MedicalTermsExtractor(config=config, log_file=args.log,
+                                      use_cache=not args.no_cache, cache_ttl=args.cache_ttl)
     
     # Category discovery mode
     discovered = None
@@ -1207,19 +1804,25 @@ def main() -> None:
     # Count-only mode: show per-category counts then exit
     if args.count_only:
         print("\nLabel coverage per category (count-only):")
+        label_counts = extractor.get_label_counts_batch(list(categories))
         for qid, name_en in categories.items():
-            try:
-                total, en, ja = extractor.get_label_counts(qid)
+            if qid in label_counts:
+                total, en, ja = label_counts[qid]
                 print(f"  - {name_en} ({qid}): total={total}, en={en}, ja={ja}")
-            except Exception as e:
-                print(f"  - {name_en} ({qid}): count failed ({e})")
+            else:
+                print(f"  - {name_en} ({qid}): count failed")
         print("=" * 60)
         print("Count-only mode: done.")
         return
 
     # Extract terms
     limit = None if args.limit == 0 else args.limit
-    df = extractor.extract_all(categories, limit_per_category=limit, target_lang=args.target_lang, target_min=args.target_count)
+    parquet_file = None
+    if config.save_parquet:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        parquet_file = Path(config.output_directory) / f"{size_name}_medical_terms_{timestamp}.parquet"
+    df = extractor.extract_all(categories, limit_per_category=limit, target_lang=args.target_lang,
+                               target_min=args.target_count, parquet_file=parquet_file)
     
     # Analyze quality
     bilingual_df = extractor.analyze_data_quality(df)
@@ -1229,15 +1832,15 @@ def main() -> None:
         print("Sample data (EN-JA pairs, first 5):")
         print("=" * 80)
         sample = bilingual_df[['en_label', 'ja_label', 'category_en']].head()
-        for idx, row in sample.iterrows():
-            en_part = row['en_label'][:30].ljust(30)
-            ja_part = row['ja_label'][:20].ljust(20)
-            cat_part = f"[{row['category_en']}]"
+        for en_label, ja_label, category_en in sample.itertuples(index=False, name=None):
+            en_part = en_label[:30].ljust(30)
+            ja_part = ja_label[:20].ljust(20)
+            cat_part = f"[{category_en}]"
             print(f"  {en_part} <-> {ja_part} {cat_part}")
         print("=" * 80 + "\n")
     
     # Save results
-    files = extractor.save_results(df, prefix=size_name)
+    files = extractor.save_results(df, prefix=size_name, parquet_file=parquet_file)
     
     print("=" * 60)
     print("Extraction completed!")